@@ -0,0 +1,113 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from benchcorpus import CorpusSpec, generate_corpus
+from main import generate_pages_recursive
+
+RESULTS_PATH = "./bench-results.jsonl"
+TEMPLATE = "<!DOCTYPE html>\n<html>\n<head><title> {{ Title }} </title></head>\n<body><article>{{ Content }}</article></body>\n</html>\n"
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+def peak_rss_bytes(who=resource.RUSAGE_SELF):
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+# builds every page of the corpus under content_dir from scratch, repeat times, and returns the best time
+def time_build(content_dir, template_path, output_root, jobs, repeat):
+    best = None
+    for run in range(repeat):
+        output_dir = os.path.join(output_root, f"run{run}")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            generate_pages_recursive(content_dir, template_path, output_dir, jobs=jobs)
+            elapsed = time.perf_counter() - started
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+def run_benchmark(spec, jobs=1, repeat=3):
+    with tempfile.TemporaryDirectory() as directory:
+        content_dir = os.path.join(directory, "content")
+        template_path = os.path.join(directory, "template.html")
+        with open(template_path, "w") as template_file:
+            template_file.write(TEMPLATE)
+        corpus_bytes = generate_corpus(content_dir, spec)
+        seconds = time_build(content_dir, template_path, os.path.join(directory, "public"), jobs, repeat)
+    peak_rss = peak_rss_bytes()
+    if jobs > 1:
+        peak_rss = max(peak_rss, peak_rss_bytes(resource.RUSAGE_CHILDREN))
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "corpus": spec.to_dict(),
+        "corpus_bytes": corpus_bytes,
+        "jobs": jobs,
+        "seconds": seconds,
+        "pages_per_second": spec.pages / seconds,
+        "megabytes_per_second": corpus_bytes / seconds / 1_000_000,
+        "peak_rss_bytes": peak_rss,
+    }
+
+# returns the most recent saved result measured with the same corpus and job count, or None
+def previous_result(results_path, result):
+    previous = None
+    try:
+        with open(results_path) as results_file:
+            for line in results_file:
+                saved = json.loads(line)
+                if (saved["corpus"] == result["corpus"]) and (saved["jobs"] == result["jobs"]):
+                    previous = saved
+    except FileNotFoundError:
+        return None
+    return previous
+
+def format_result(result, previous=None):
+    lines = [
+        f"commit {result['commit']}: {result['corpus']['pages']} pages, {result['corpus_bytes'] / 1_000_000:.1f} MB, {result['jobs']} job(s)",
+        f"  {result['seconds']:.3f} s  {result['pages_per_second']:.1f} pages/s  {result['megabytes_per_second']:.2f} MB/s  peak RSS {result['peak_rss_bytes'] / 1_000_000:.1f} MB",
+    ]
+    if previous is not None:
+        change = (result["pages_per_second"] / previous["pages_per_second"] - 1) * 100
+        lines.append(f"  {change:+.1f}% pages/s compared to commit {previous['commit']} ({previous['pages_per_second']:.1f} pages/s)")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure full-build throughput on a deterministic synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=4000, help="approximate characters per page")
+    parser.add_argument("--list-ratio", type=float, default=0.2)
+    parser.add_argument("--quote-ratio", type=float, default=0.1)
+    parser.add_argument("--code-ratio", type=float, default=0.1)
+    parser.add_argument("--inline-density", type=float, default=0.1, help="fraction of words with inline markup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="builds to run; the fastest is reported")
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON lines file results are appended to")
+    arguments = parser.parse_args(argv)
+    spec = CorpusSpec(
+        arguments.pages, arguments.page_size, arguments.list_ratio, arguments.quote_ratio,
+        arguments.code_ratio, arguments.inline_density, arguments.seed,
+    )
+    result = run_benchmark(spec, arguments.jobs, arguments.repeat)
+    print(format_result(result, previous_result(arguments.output, result)))
+    with open(arguments.output, "a") as results_file:
+        results_file.write(json.dumps(result) + "\n")
+
+if __name__ == "__main__":
+    main()
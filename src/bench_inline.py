@@ -0,0 +1,100 @@
+import argparse
+import random
+import re
+import timeit
+from benchcorpus import inline_text
+from textnode import TextNode, TextType
+from textparsing import split_nodes_delimiter, text_to_text_nodes, text_to_text_nodes_reference, append_text_nodes
+
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+# the list.index based splitter that split_nodes_delimiter replaced, kept as the benchmark baseline
+def split_nodes_delimiter_indexed(old_nodes, delimiter, text_type):
+    new_nodes = []
+    for node in old_nodes:
+        if node.textType != TextType.TEXT:
+            new_nodes.append(node)
+        else:
+            split_nodes = node.text.split(delimiter)
+            if (len(split_nodes) % 2 == 0) and (len(split_nodes) > 1):
+                raise ValueError("Malformed Markdown. Odd number of delimiters in text.")
+            else:
+                for split in split_nodes:
+                    if split_nodes.index(split) % 2 == 0:
+                        if split != '':
+                            split_node = TextNode(split, TextType.TEXT)
+                            new_nodes.append(split_node)
+                    else:
+                        if split != '':
+                            split_node = TextNode(split, text_type)
+                            new_nodes.append(split_node)
+    return new_nodes
+
+# the image scan followed by a link scan of each gap that MARKDOWN_SPAN_PATTERN replaced, kept as the baseline
+def append_text_nodes_two_scans(nodes, text):
+    position = 0
+    for image in IMAGE_PATTERN.finditer(text):
+        append_link_nodes(nodes, text, position, image.start())
+        nodes.append(TextNode(image.group(1), TextType.IMAGE, image.group(2)))
+        position = image.end()
+    append_link_nodes(nodes, text, position, len(text))
+
+def append_link_nodes(nodes, text, start, end):
+    position = start
+    for link in LINK_PATTERN.finditer(text, start, end):
+        if link.start() > position:
+            nodes.append(TextNode(text[position:link.start()], TextType.TEXT))
+        nodes.append(TextNode(link.group(1), TextType.LINK, link.group(2)))
+        position = link.end()
+    if end > position:
+        nodes.append(TextNode(text[position:end], TextType.TEXT))
+
+# segments alternate between distinct plain words and code spans, so the baseline's index lookups are not
+# short-circuited by repeated text
+def code_span_text(segments):
+    return "".join(f"word{number} `code{number}`" for number in range(segments // 2))
+
+def markup_paragraph(words):
+    markup = ["plain", "**bold**", "*italic*", "`code`", "[link](/url)", "![image](/image.png)"]
+    return " ".join(markup[number % len(markup)] if number % 3 == 0 else f"word{number}" for number in range(words))
+
+def bracket_text(spans):
+    return " ".join(f"[link{number}](/url{number}) ![image{number}](/image{number}.png) [note] (aside)" for number in range(spans // 2))
+
+def best_time(function, repeat, number):
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+def report(name, baseline_name, baseline_seconds, current_name, current_seconds):
+    print(f"{name}:")
+    print(f"  {baseline_name:<32} {baseline_seconds * 1000:10.3f} ms")
+    print(f"  {current_name:<32} {current_seconds * 1000:10.3f} ms  ({baseline_seconds / current_seconds:.1f}x)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for inline markdown parsing.")
+    parser.add_argument("--segments", type=int, default=10000, help="segments in the delimiter benchmark input")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args(argv)
+
+    nodes = [TextNode(code_span_text(arguments.segments), TextType.TEXT)]
+    baseline = best_time(lambda: split_nodes_delimiter_indexed(nodes, "`", TextType.CODE), arguments.repeat, 1)
+    current = best_time(lambda: split_nodes_delimiter(nodes, "`", TextType.CODE), arguments.repeat, 1)
+    report(f"split_nodes_delimiter, {arguments.segments} segments", "list.index baseline", baseline, "offset scan", current)
+
+    paragraph = markup_paragraph(200)
+    baseline = best_time(lambda: text_to_text_nodes_reference(paragraph), arguments.repeat, 200)
+    current = best_time(lambda: text_to_text_nodes(paragraph), arguments.repeat, 200)
+    report("text_to_text_nodes, 200-word paragraph", "five-pass reference", baseline, "single-scan tokenizer", current)
+
+    text = bracket_text(400)
+    baseline = best_time(lambda: append_text_nodes_two_scans([], text), arguments.repeat, 200)
+    current = best_time(lambda: append_text_nodes([], text), arguments.repeat, 200)
+    report("image and link spans, 400 spans", "image scan then link scans", baseline, "combined span scan", current)
+
+    text = inline_text(random.Random(0), 0.1, 2000)
+    baseline = best_time(lambda: append_text_nodes_two_scans([], text), arguments.repeat, 200)
+    current = best_time(lambda: append_text_nodes([], text), arguments.repeat, 200)
+    report("image and link spans, 2000 corpus words", "image scan then link scans", baseline, "combined span scan", current)
+
+if __name__ == "__main__":
+    main()
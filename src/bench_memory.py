@@ -0,0 +1,68 @@
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from benchcorpus import CorpusSpec, generate_page_markdown
+from flattree import markdown_to_flat_page
+from htmlnode import HTMLNode, text_node_to_html_node
+from markdowntohtml import markdown_to_html_node
+from textparsing import text_to_text_nodes
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, HTMLNode) and node.children:
+            stack.extend(node.children)
+    return count
+
+# returns the result of build() and the bytes it still holds allocated once it returns
+def retained_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+# times a full collection while result is alive, which scales with the number of objects tracked by the collector
+def collection_seconds():
+    started = time.perf_counter()
+    gc.collect()
+    return time.perf_counter() - started
+
+def report(name, node_count, total_bytes):
+    print(f"{name:<24} {node_count:>9} nodes {total_bytes / 1_000_000:9.1f} MB {total_bytes / node_count:8.1f} bytes/node")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory held by parsed node trees of a large synthetic page.")
+    parser.add_argument("--page-size", type=int, default=4_000_000, help="approximate characters in the page")
+    parser.add_argument("--inline-density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(argv)
+    spec = CorpusSpec(page_size=arguments.page_size, inline_density=arguments.inline_density, seed=arguments.seed)
+    markdown = generate_page_markdown(random.Random(arguments.seed), spec, 0)
+    # text nodes and their HTML leaves hold slices of the source, so the text itself is counted in every figure
+    paragraphs = [block for block in markdown.split("\n\n") if not block.startswith(("#", "```", ">", "*", "1"))]
+    text_nodes, text_bytes = retained_bytes(lambda: [node for block in paragraphs for node in text_to_text_nodes(block)])
+    report("TextNode", len(text_nodes), text_bytes)
+    leaf_nodes, leaf_bytes = retained_bytes(lambda: [text_node_to_html_node(node) for node in text_nodes])
+    report("LeafNode", len(leaf_nodes), leaf_bytes)
+    del text_nodes, leaf_nodes
+    tree, tree_bytes = retained_bytes(lambda: markdown_to_html_node(markdown))
+    node_count = count_nodes(tree)
+    report("markdown_to_html_node", node_count, tree_bytes)
+    print(f"{'':<24} full collection with the tree alive: {collection_seconds() * 1000:.1f} ms")
+    del tree
+    page, flat_bytes = retained_bytes(lambda: markdown_to_flat_page(markdown))
+    report("markdown_to_flat_page", len(page.node), flat_bytes)
+    print(f"{'':<24} full collection with the flat document alive: {collection_seconds() * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
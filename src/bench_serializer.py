@@ -0,0 +1,125 @@
+import argparse
+import timeit
+from htmlnode import LeafNode, ParentNode, escape_text, escape_attribute
+
+# the recursive, concatenating ParentNode.to_html that the explicit-stack serializer replaced, kept as the baseline
+def recursive_to_html(node):
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    children_html = ''
+    html_props = node.props_to_html()
+    for child in node.children:
+        child_html = f'{recursive_to_html(child)}'
+        children_html = children_html + child_html
+    return f'<{node.tag}{html_props}>{children_html}</{node.tag}>'
+
+# the recursive ParentNode.iter_html that the explicit-stack one replaced, chaining one generator per level
+def recursive_iter_html(node):
+    if not isinstance(node, ParentNode):
+        yield node.to_html()
+        return
+    yield f'<{node.tag}{node.props_to_html()}>'
+    for child in node.children:
+        yield from recursive_iter_html(child)
+    yield f'</{node.tag}>'
+
+# the props and tag formatting that the tag tables and props memo replaced: every attribute is concatenated
+# onto a growing string and every tag is formatted anew for each node
+def formatted_props(node):
+    if node.props == None:
+        return ""
+    props_html = ""
+    for key in node.props:
+        props_html = props_html + ' ' + f'{key}' + '=' + f'"{escape_attribute(node.props[key])}"'
+    return props_html
+
+def formatted_leaf_html(node):
+    if (node.tag is None) or (node.tag == ""):
+        return escape_text(node.value)
+    return f'<{node.tag}{formatted_props(node)}>{escape_text(node.value)}</{node.tag}>'
+
+# the explicit-stack to_html with per-node tag formatting, kept as the baseline for the tag tables
+def formatted_to_html(node):
+    fragments = [f'<{node.tag}{formatted_props(node)}>']
+    append = fragments.append
+    stack = [(iter(node.children), f'</{node.tag}>')]
+    while stack:
+        children, close_tag = stack[-1]
+        for child in children:
+            if isinstance(child, ParentNode):
+                append(f'<{child.tag}{formatted_props(child)}>')
+                stack.append((iter(child.children), f'</{child.tag}>'))
+                break
+            append(formatted_leaf_html(child))
+        else:
+            append(close_tag)
+            stack.pop()
+    return "".join(fragments)
+
+# like a parsed list, most items are plain leaves and every fourth holds inline markup
+def wide_tree(items):
+    item_nodes = []
+    for number in range(items):
+        if number % 4 == 0:
+            item_nodes.append(ParentNode("li", [LeafNode(None, f"item {number} "), LeafNode("b", "bold")]))
+        else:
+            item_nodes.append(LeafNode("li", f"item {number}"))
+    return ParentNode("ul", item_nodes)
+
+# like a parsed page: paragraphs of text, bold and code spans, links to a few dozen pages and images
+def markup_tree(paragraphs):
+    paragraph_nodes = []
+    for number in range(paragraphs):
+        page = number % 40
+        paragraph_nodes.append(ParentNode("p", [
+            LeafNode(None, f"paragraph {number} with "),
+            LeafNode("b", "bold"),
+            LeafNode(None, " and "),
+            LeafNode("code", "code"),
+            LeafNode(None, ", a "),
+            LeafNode("a", "link", {"href": f"/pages/{page}"}),
+            LeafNode(None, " and an image "),
+            LeafNode("img", "", {"src": f"/images/{page}.png", "alt": f"image {page}"}),
+        ]))
+    return ParentNode("div", paragraph_nodes)
+
+def deep_tree(depth):
+    node = LeafNode("p", "leaf")
+    for level in range(depth):
+        node = ParentNode("div", [node, LeafNode("span", f"level {level}")], {"class": "nested"})
+    return node
+
+def best_time(function, repeat):
+    return min(timeit.repeat(function, repeat=repeat, number=1))
+
+def report_time(name, function, repeat):
+    try:
+        seconds = best_time(function, repeat)
+    except RecursionError:
+        print(f"  {name:<28} RecursionError")
+        return
+    print(f"  {name:<28} {seconds * 1000:10.3f} ms")
+
+def report(name, tree, repeat):
+    print(f"{name}:")
+    report_time("recursive to_html baseline", lambda: recursive_to_html(tree), repeat)
+    report_time("formatted tags baseline", lambda: formatted_to_html(tree), repeat)
+    report_time("to_html", tree.to_html, repeat)
+    report_time("recursive iter_html baseline", lambda: "".join(recursive_iter_html(tree)), repeat)
+    report_time("iter_html", lambda: "".join(tree.iter_html()), repeat)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serializer benchmarks on wide and deep node trees.")
+    parser.add_argument("--items", type=int, default=50000, help="list items in the wide tree")
+    parser.add_argument("--paragraphs", type=int, default=10000, help="paragraphs in the markup tree")
+    parser.add_argument("--depth", type=int, default=500, help="nesting depth of the deep tree; stays under the recursion limit")
+    parser.add_argument("--very-deep", type=int, default=20000, help="nesting depth of a tree past the recursion limit")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args(argv)
+    report(f"wide tree, {arguments.items} list items", wide_tree(arguments.items), arguments.repeat)
+    report(f"markup tree, {arguments.paragraphs} paragraphs", markup_tree(arguments.paragraphs), arguments.repeat)
+    report(f"deep tree, depth {arguments.depth}", deep_tree(arguments.depth), arguments.repeat)
+    report(f"deep tree, depth {arguments.very_deep}", deep_tree(arguments.very_deep), arguments.repeat)
+
+if __name__ == "__main__":
+    main()
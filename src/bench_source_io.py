@@ -0,0 +1,61 @@
+import argparse
+import os
+import random
+import tempfile
+import timeit
+import tracemalloc
+from benchcorpus import CorpusSpec, generate_page_markdown
+from markdownparsing import iter_block_spans
+from sourceio import read_source
+
+SIZES = [64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024]
+
+# threshold 0 always maps the file and a threshold above its size always reads it whole
+def split_source(path, threshold):
+    for span in iter_block_spans(read_source(path, threshold)):
+        pass
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(path, size, repeat):
+    buffered = lambda: split_source(path, size + 1)
+    mapped = lambda: split_source(path, 0)
+    return {
+        "buffered_seconds": min(timeit.repeat(buffered, repeat=repeat, number=1)),
+        "mapped_seconds": min(timeit.repeat(mapped, repeat=repeat, number=1)),
+        "buffered_peak": peak_memory(buffered),
+        "mapped_peak": peak_memory(mapped),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare buffered and memory-mapped source reading by file size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="source sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args(argv)
+    print(f"{'size':>12} {'buffered':>12} {'mapped':>12} {'buffered peak':>15} {'mapped peak':>13}")
+    crossover = None
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sorted(arguments.sizes):
+            path = os.path.join(directory, f"source{size}.md")
+            with open(path, "w") as source_file:
+                source_file.write(generate_page_markdown(random.Random(size), CorpusSpec(page_size=size), 0))
+            result = measure(path, os.path.getsize(path), arguments.repeat)
+            print(
+                f"{size:>12} {result['buffered_seconds'] * 1000:10.2f}ms {result['mapped_seconds'] * 1000:10.2f}ms"
+                f" {result['buffered_peak'] / 1_000_000:13.1f}MB {result['mapped_peak'] / 1_000_000:11.1f}MB"
+            )
+            if (crossover is None) and (result["mapped_seconds"] < result["buffered_seconds"]):
+                crossover = size
+    if crossover is None:
+        print("Buffered reads were faster at every size.")
+    else:
+        print(f"Memory-mapped reads were first faster at {crossover} bytes.")
+
+if __name__ == "__main__":
+    main()
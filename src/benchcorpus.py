@@ -0,0 +1,96 @@
+import os
+import random
+
+WORDS = (
+    "the ring of power was forged in the fires of mount doom by sauron the dark lord "
+    "frodo and sam walked through the shire past bree and rivendell over the misty mountains "
+    "gandalf the grey fought the balrog in moria while aragorn led the fellowship onward "
+    "elves dwarves hobbits and men gathered at the council of elrond to decide its fate"
+).split()
+
+# pages is the number of pages to generate, page_size the approximate number of characters per page
+# list_ratio, quote_ratio and code_ratio are the fractions of blocks that are lists, quotes and code blocks;
+# the remaining blocks are paragraphs, with a heading every few blocks
+# inline_density is the fraction of words wrapped in bold, italic, code, link or image markup
+# seed makes the corpus deterministic: the same arguments always produce the same files
+class CorpusSpec:
+    def __init__(self, pages=1000, page_size=4000, list_ratio=0.2, quote_ratio=0.1, code_ratio=0.1, inline_density=0.1, seed=0):
+        self.pages = pages
+        self.page_size = page_size
+        self.list_ratio = list_ratio
+        self.quote_ratio = quote_ratio
+        self.code_ratio = code_ratio
+        self.inline_density = inline_density
+        self.seed = seed
+    def to_dict(self):
+        return {
+            "pages": self.pages,
+            "page_size": self.page_size,
+            "list_ratio": self.list_ratio,
+            "quote_ratio": self.quote_ratio,
+            "code_ratio": self.code_ratio,
+            "inline_density": self.inline_density,
+            "seed": self.seed,
+        }
+
+def inline_word(rng, density):
+    word = rng.choice(WORDS)
+    if rng.random() >= density:
+        return word
+    markup = rng.randrange(5)
+    if markup == 0:
+        return f"**{word}**"
+    elif markup == 1:
+        return f"*{word}*"
+    elif markup == 2:
+        return f"`{word}`"
+    elif markup == 3:
+        return f"[{word}](/{rng.choice(WORDS)}/{word})"
+    else:
+        return f"![{word}](/images/{word}.png)"
+
+def inline_text(rng, density, word_count):
+    return " ".join(inline_word(rng, density) for _ in range(word_count))
+
+def generate_block(rng, spec):
+    choice = rng.random()
+    if choice < spec.list_ratio:
+        item_count = rng.randint(2, 9)
+        if rng.random() < 0.5:
+            return "\n".join(f"* {inline_text(rng, spec.inline_density, rng.randint(3, 12))}" for _ in range(item_count))
+        return "\n".join(f"{number}. {inline_text(rng, spec.inline_density, rng.randint(3, 12))}" for number in range(1, item_count + 1))
+    choice -= spec.list_ratio
+    if choice < spec.quote_ratio:
+        line_count = rng.randint(1, 4)
+        return "\n".join(f"> {inline_text(rng, spec.inline_density, rng.randint(6, 16))}" for _ in range(line_count))
+    choice -= spec.quote_ratio
+    if choice < spec.code_ratio:
+        line_count = rng.randint(2, 8)
+        code_lines = "\n".join(f"    {rng.choice(WORDS)}({rng.choice(WORDS)})" for _ in range(line_count))
+        return f"```\n{code_lines}\n```"
+    line_count = rng.randint(1, 4)
+    return "\n".join(inline_text(rng, spec.inline_density, rng.randint(8, 20)) for _ in range(line_count))
+
+def generate_page_markdown(rng, spec, page_number):
+    blocks = [f"# Page {page_number}: {inline_text(rng, 0, 4)}"]
+    size = len(blocks[0])
+    while size < spec.page_size:
+        if len(blocks) % 6 == 0:
+            block = f"{'#' * rng.randint(2, 4)} {inline_text(rng, spec.inline_density, rng.randint(2, 6))}"
+        else:
+            block = generate_block(rng, spec)
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks) + "\n"
+
+# writes the corpus under directory, fifty pages per subdirectory, and returns the total bytes written
+def generate_corpus(directory, spec):
+    rng = random.Random(spec.seed)
+    total_bytes = 0
+    for page_number in range(spec.pages):
+        page_dir = os.path.join(directory, f"section{page_number // 50:04d}")
+        os.makedirs(page_dir, exist_ok=True)
+        markdown = generate_page_markdown(rng, spec, page_number)
+        with open(os.path.join(page_dir, f"page{page_number:05d}.md"), "w") as page_file:
+            total_bytes += page_file.write(markdown)
+    return total_bytes
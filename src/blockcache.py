@@ -0,0 +1,100 @@
+import hashlib
+import os
+from collections import OrderedDict
+from buildmanifest import GENERATOR_VERSION
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# maps the text of a markdown block to the HTML rendered from it, so blocks repeated across pages are parsed once
+# max_entries bounds the in-memory store, which evicts the least recently used fragment when full
+# directory is an optional on-disk store shared between builds and worker processes; a fragment missing
+# from memory is looked up there before the block is rendered again
+# keys include GENERATOR_VERSION, so fragments rendered by an older generator are never returned
+class BlockCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.fragments = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # fragments held by the caches of pool workers whose stats were merged in
+        self.merged_entries = 0
+    @staticmethod
+    def key(block):
+        return hashlib.sha256(f"{GENERATOR_VERSION}\0{block}".encode()).hexdigest()
+    def fragment_path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key[2:]}.html")
+    def get(self, block):
+        key = self.key(block)
+        fragment = self.fragments.get(key)
+        if fragment is not None:
+            self.fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+        if self.directory is not None:
+            try:
+                with open(self.fragment_path(key), encoding="utf-8") as fragment_file:
+                    fragment = fragment_file.read()
+            except OSError:
+                pass
+            else:
+                self.store(key, fragment)
+                self.disk_hits += 1
+                return fragment
+        self.misses += 1
+        return None
+    def put(self, block, fragment):
+        key = self.key(block)
+        self.store(key, fragment)
+        if self.directory is not None:
+            path = self.fragment_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # written beside the entry and renamed over it, so another process never reads a partial fragment
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as fragment_file:
+                fragment_file.write(fragment)
+            os.replace(temporary_path, path)
+    def store(self, key, fragment):
+        self.fragments[key] = fragment
+        self.fragments.move_to_end(key)
+        while len(self.fragments) > self.max_entries:
+            self.fragments.popitem(last=False)
+            self.evictions += 1
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.fragments) + self.merged_entries,
+        }
+    # adds counts from another cache's stats, such as a pool worker's, the way BuildProfiler.merge does
+    def merge(self, stats):
+        self.hits += stats["hits"]
+        self.disk_hits += stats["disk_hits"]
+        self.misses += stats["misses"]
+        self.evictions += stats["evictions"]
+        self.merged_entries += stats["entries"]
+    def summary(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        hit_rate = ((self.hits + self.disk_hits) / lookups * 100) if lookups else 0.0
+        return (
+            f"Block cache: {self.hits} hits, {self.disk_hits} disk hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+            f"{self.evictions} evictions, {len(self.fragments) + self.merged_entries} entries."
+        )
+
+# the cache used by generate_page, or None when block caching is off
+active_block_cache = None
+
+def enable_block_cache(max_entries=DEFAULT_MAX_ENTRIES, directory=None):
+    global active_block_cache
+    active_block_cache = BlockCache(max_entries, directory)
+    return active_block_cache
+
+def disable_block_cache():
+    global active_block_cache
+    cache = active_block_cache
+    active_block_cache = None
+    return cache
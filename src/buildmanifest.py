@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+
+# GENERATOR_VERSION identifies the page generator; bump it whenever a code change alters generated HTML
+# so that every page recorded under an older version is rebuilt on the next run
+GENERATOR_VERSION = "3"
+MANIFEST_FORMAT = 1
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        while True:
+            chunk = source_file.read(1024 * 1024)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def normalize_path(path):
+    return os.path.normpath(os.fspath(path))
+
+# path is the location of the manifest file on disk
+# files maps a source path to its last seen size, mtime and content hash, so unchanged files are not re-hashed
+# pages maps a markdown source path to the source hash, template hash and generator version it was built with,
+# plus the output path relative to the output directory
+# static_files lists the static asset paths, relative to the output directory, copied by the last build
+class BuildManifest:
+    def __init__(self, path, files=None, pages=None, static_files=None):
+        self.path = path
+        self.files = files if files is not None else {}
+        self.pages = pages if pages is not None else {}
+        self.static_files = static_files if static_files is not None else []
+        self.seen_pages = set()
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+            return cls(path)
+        return cls(path, data.get("files", {}), data.get("pages", {}), data.get("static_files", []))
+    def save(self):
+        data = {
+            "format": MANIFEST_FORMAT,
+            "files": self.files,
+            "pages": self.pages,
+            "static_files": self.static_files,
+        }
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(data, manifest_file, indent=1, sort_keys=True)
+        os.replace(temporary_path, self.path)
+    def file_hash(self, path):
+        key = normalize_path(path)
+        stat = os.stat(key)
+        entry = self.files.get(key)
+        if (entry is not None) and (entry["size"] == stat.st_size) and (entry["mtime_ns"] == stat.st_mtime_ns):
+            return entry["hash"]
+        content_hash = hash_file(key)
+        self.files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": content_hash}
+        return content_hash
+    def page_is_current(self, source_path, output_path, output_dir, template_hash):
+        key = normalize_path(source_path)
+        self.seen_pages.add(key)
+        entry = self.pages.get(key)
+        if entry is None:
+            return False
+        relative_output = os.path.relpath(output_path, output_dir)
+        return (
+            entry["output"] == relative_output and
+            entry["template_hash"] == template_hash and
+            entry["generator_version"] == GENERATOR_VERSION and
+            entry["source_hash"] == self.file_hash(key) and
+            os.path.isfile(output_path)
+        )
+    def record_page(self, source_path, output_path, output_dir, template_hash):
+        key = normalize_path(source_path)
+        self.seen_pages.add(key)
+        self.pages[key] = {
+            "source_hash": self.file_hash(key),
+            "template_hash": template_hash,
+            "generator_version": GENERATOR_VERSION,
+            "output": os.path.relpath(output_path, output_dir),
+        }
+    # removes the output of a recorded page and forgets it
+    def remove_page(self, source_path, output_dir):
+        key = normalize_path(source_path)
+        entry = self.pages.pop(key, None)
+        self.files.pop(key, None)
+        self.seen_pages.discard(key)
+        if entry is None:
+            return
+        output_path = os.path.join(output_dir, entry["output"])
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+            remove_empty_parents(os.path.dirname(output_path), output_dir)
+    # removes the output of every recorded page whose source was not seen during this build
+    # returns the list of removed source paths
+    def remove_stale_pages(self, output_dir):
+        stale_sources = [source for source in self.pages if source not in self.seen_pages]
+        for source in stale_sources:
+            self.remove_page(source, output_dir)
+        return stale_sources
+
+def remove_empty_parents(directory, stop_dir):
+    stop_dir = os.path.abspath(stop_dir)
+    directory = os.path.abspath(directory)
+    while directory.startswith(stop_dir + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
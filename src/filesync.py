@@ -0,0 +1,116 @@
+import os
+import shutil
+from buildmanifest import remove_empty_parents
+
+# a destination file is current when its size and modification time match the source;
+# copy_file preserves the source mtime, so this holds for every file synced by a previous build
+def file_is_current(source_stat, destination_path):
+    try:
+        destination_stat = os.stat(destination_path)
+    except FileNotFoundError:
+        return False
+    return (
+        destination_stat.st_size == source_stat.st_size and
+        destination_stat.st_mtime_ns == source_stat.st_mtime_ns
+    )
+
+# copies with os.copy_file_range, which lets the kernel (and copy-on-write filesystems) skip user space entirely,
+# then os.sendfile, then a plain buffered copy; a method is only abandoned if it fails before copying anything,
+# which includes copying nothing without an error, as copy_file_range does on some filesystems
+def copy_file_contents(source_file, destination_file, size):
+    source_fd = source_file.fileno()
+    destination_fd = destination_file.fileno()
+    if hasattr(os, "copy_file_range"):
+        copied = 0
+        try:
+            while copied < size:
+                count = os.copy_file_range(source_fd, destination_fd, size - copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            if copied > 0:
+                raise
+        else:
+            if (copied > 0) or (size == 0):
+                return
+    if hasattr(os, "sendfile"):
+        copied = 0
+        try:
+            while copied < size:
+                count = os.sendfile(destination_fd, source_fd, copied, size - copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            if copied > 0:
+                raise
+        else:
+            if (copied > 0) or (size == 0):
+                return
+    shutil.copyfileobj(source_file, destination_file)
+
+# the destination is unlinked rather than overwritten so that a hardlinked copy of it elsewhere is never modified
+# link=True hardlinks the destination to the source when the filesystem allows it, and copies otherwise
+def copy_file(source_path, destination_path, link=False):
+    if os.path.lexists(destination_path):
+        os.unlink(destination_path)
+    if link:
+        try:
+            os.link(source_path, destination_path)
+            return
+        except OSError:
+            pass
+    with open(source_path, "rb") as source_file, open(destination_path, "wb") as destination_file:
+        copy_file_contents(source_file, destination_file, os.fstat(source_file.fileno()).st_size)
+    shutil.copystat(source_path, destination_path)
+
+# copies every file under source that is missing or changed in destination
+# returns the set of all file paths under source, relative to source, and the number of files copied
+def sync_directory(source, destination, link=False):
+    synced_files = set()
+    copied_count = 0
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        destination_dir = os.path.join(destination, relative_dir)
+        os.makedirs(destination_dir, exist_ok=True)
+        with os.scandir(os.path.join(source, relative_dir)) as entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name)
+                if entry.is_file():
+                    synced_files.add(relative_path)
+                    destination_path = os.path.join(destination, relative_path)
+                    if not file_is_current(entry.stat(), destination_path):
+                        copy_file(entry.path, destination_path, link)
+                        copied_count += 1
+                elif entry.is_dir():
+                    pending.append(relative_path)
+    return synced_files, copied_count
+
+# removes files listed in previous_files but not in current_files, along with directories left empty
+# returns the sorted list of removed relative paths
+def remove_stale_files(destination, previous_files, current_files):
+    removed = []
+    for relative_path in sorted(set(previous_files) - set(current_files)):
+        destination_path = os.path.join(destination, relative_path)
+        if os.path.lexists(destination_path) and not os.path.isdir(destination_path):
+            os.unlink(destination_path)
+            remove_empty_parents(os.path.dirname(destination_path), destination)
+            removed.append(relative_path)
+    return removed
+
+# recreates the tree under source in destination with every file hardlinked rather than copied,
+# falling back to copy_file where hardlinks are not supported
+def link_tree(source, destination):
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        os.makedirs(os.path.join(destination, relative_dir), exist_ok=True)
+        with os.scandir(os.path.join(source, relative_dir)) as entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(relative_path)
+                else:
+                    copy_file(entry.path, os.path.join(destination, relative_path), link=True)
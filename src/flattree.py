@@ -0,0 +1,241 @@
+from array import array
+from htmlnode import LeafNode, ParentNode, FragmentNode, OPEN_TAGS, CLOSE_TAGS, escape_text, props_html
+from markdownparsing import BlockType, iter_block_spans
+from markdowntohtml import ParsedPage, span_to_html_node, cached_block_node
+
+# node kinds
+LEAF = 0
+PARENT = 1
+FRAGMENT = 2
+
+CHUNK_NODES = 4096
+
+# a document tree stored as parallel arrays indexed by node number, with nodes numbered in document order,
+# so a parent is always followed by its first child; nothing in it is tracked by the garbage collector
+# kinds holds LEAF, PARENT or FRAGMENT for every node
+# tag_ids index tags, the table of distinct tag names, or are -1 for a leaf written without a tag
+# parents holds each node's parent number and next_siblings its next sibling's number, both -1 if there is none
+# text_starts and text_ends are offsets into text, the one string holding every leaf and fragment value;
+# leaf values are stored unescaped and escaped as they are serialized, like LeafNode values
+# prop_ids index props, the table of props dictionaries, or are -1 for a node without props
+# HTMLNode trees can be rebuilt from it with to_node, for code written against the node classes
+class FlatDocument:
+    def __init__(self, kinds, tag_ids, parents, next_siblings, text_starts, text_ends, prop_ids, tags, props, text):
+        self.kinds = kinds
+        self.tag_ids = tag_ids
+        self.parents = parents
+        self.next_siblings = next_siblings
+        self.text_starts = text_starts
+        self.text_ends = text_ends
+        self.prop_ids = prop_ids
+        self.tags = tags
+        self.props = props
+        self.text = text
+    @classmethod
+    def from_node(cls, node):
+        builder = FlatDocumentBuilder()
+        builder.add_node(node)
+        return builder.build()
+    def __len__(self):
+        return len(self.kinds)
+    def tag(self, index):
+        tag_id = self.tag_ids[index]
+        return None if tag_id == -1 else self.tags[tag_id]
+    def value(self, index):
+        if self.kinds[index] == PARENT:
+            return ""
+        return self.text[self.text_starts[index]:self.text_ends[index]]
+    def node_props(self, index):
+        prop_id = self.prop_ids[index]
+        return None if prop_id == -1 else self.props[prop_id]
+    def children(self, index):
+        child = index + 1
+        if (self.kinds[index] != PARENT) or (child >= len(self.kinds)) or (self.parents[child] != index):
+            return
+        while child != -1:
+            yield child
+            child = self.next_siblings[child]
+    # walks the arrays once, from the first node to the last: a parent's close tag is written when the walk
+    # reaches a node outside it, which the stack of open parents tells from the node's parent number
+    # the HTML of every CHUNK_NODES nodes is joined and yielded as one chunk
+    def iter_html(self):
+        kinds = self.kinds
+        tag_ids = self.tag_ids
+        parents = self.parents
+        text_starts = self.text_starts
+        text_ends = self.text_ends
+        prop_ids = self.prop_ids
+        props = self.props
+        text = self.text
+        open_tags = [OPEN_TAGS[tag] for tag in self.tags]
+        close_tags = [CLOSE_TAGS[tag] for tag in self.tags]
+        open_parents = []
+        node_count = len(kinds)
+        for chunk_start in range(0, node_count, CHUNK_NODES):
+            fragments = []
+            append = fragments.append
+            for index in range(chunk_start, min(chunk_start + CHUNK_NODES, node_count)):
+                parent = parents[index]
+                while open_parents and (open_parents[-1] != parent):
+                    append(close_tags[tag_ids[open_parents.pop()]])
+                kind = kinds[index]
+                tag_id = tag_ids[index]
+                if kind == FRAGMENT:
+                    append(text[text_starts[index]:text_ends[index]])
+                elif tag_id < 0:
+                    # a leaf without a tag is written as its text alone, ignoring any props, as LeafNode.to_html does
+                    append(escape_text(text[text_starts[index]:text_ends[index]]))
+                else:
+                    prop_id = prop_ids[index]
+                    if prop_id < 0:
+                        open_tag = open_tags[tag_id]
+                    else:
+                        open_tag = f"<{self.tags[tag_id]}{props_html(props[prop_id])}>"
+                    append(open_tag)
+                    if kind == PARENT:
+                        open_parents.append(index)
+                    else:
+                        append(escape_text(text[text_starts[index]:text_ends[index]]))
+                        append(close_tags[tag_id])
+            yield "".join(fragments)
+        closing = []
+        while open_parents:
+            closing.append(close_tags[tag_ids[open_parents.pop()]])
+        if closing:
+            yield "".join(closing)
+    def to_html(self):
+        return "".join(self.iter_html())
+    def write_html(self, fp):
+        for chunk in self.iter_html():
+            fp.write(chunk)
+    # rebuilds the subtree rooted at node number index as HTMLNode objects
+    def to_node(self, index=0):
+        nodes = {}
+        for number in range(index, len(self.kinds)):
+            parent = self.parents[number]
+            if (number != index) and (parent not in nodes):
+                break
+            kind = self.kinds[number]
+            if kind == PARENT:
+                node = ParentNode(self.tag(number), [], self.node_props(number))
+            elif kind == LEAF:
+                node = LeafNode(self.tag(number), self.value(number), self.node_props(number))
+            else:
+                node = FragmentNode(self.value(number))
+            if number != index:
+                nodes[parent].children.append(node)
+            if kind == PARENT:
+                nodes[number] = node
+            elif number == index:
+                return node
+        return nodes[index]
+    def __repr__(self):
+        return f"FlatDocument({len(self.kinds)} nodes, {len(self.tags)} tags, {len(self.text)} characters of text)"
+
+# appends nodes in document order: start_parent opens a parent that the following nodes belong to
+# until the matching end_parent; node trees are validated as they are added, as to_html would
+class FlatDocumentBuilder:
+    def __init__(self):
+        self.kinds = array("b")
+        self.tag_ids = array("i")
+        self.parents = array("i")
+        self.next_siblings = array("i")
+        self.text_starts = array("q")
+        self.text_ends = array("q")
+        self.prop_ids = array("i")
+        self.tags = []
+        self.tag_numbers = {}
+        self.props = []
+        self.text_parts = []
+        self.text_length = 0
+        self.open_parents = []
+        # the last child added to each open parent, with the top level first
+        self.last_children = [-1]
+    def add(self, kind, tag, value, props):
+        index = len(self.kinds)
+        previous_sibling = self.last_children[-1]
+        if previous_sibling != -1:
+            self.next_siblings[previous_sibling] = index
+        self.last_children[-1] = index
+        if (tag is None) or (tag == ""):
+            tag_id = -1
+        else:
+            tag_id = self.tag_numbers.get(tag)
+            if tag_id is None:
+                tag_id = len(self.tags)
+                self.tags.append(tag)
+                self.tag_numbers[tag] = tag_id
+        if props is None:
+            self.prop_ids.append(-1)
+        else:
+            self.prop_ids.append(len(self.props))
+            self.props.append(props)
+        self.kinds.append(kind)
+        self.tag_ids.append(tag_id)
+        self.parents.append(self.open_parents[-1] if self.open_parents else -1)
+        self.next_siblings.append(-1)
+        self.text_starts.append(self.text_length)
+        self.text_parts.append(value)
+        self.text_length += len(value)
+        self.text_ends.append(self.text_length)
+        return index
+    def start_parent(self, tag, props=None):
+        if (tag is None) or (tag == ""):
+            raise ValueError("No tag; tag is required.")
+        self.open_parents.append(self.add(PARENT, tag, "", props))
+        self.last_children.append(-1)
+    def end_parent(self):
+        self.open_parents.pop()
+        self.last_children.pop()
+    def add_leaf(self, tag, value, props=None):
+        if value is None:
+            raise ValueError("No value; value is required.")
+        self.add(LEAF, tag, str(value), props)
+    def add_fragment(self, html):
+        self.add(FRAGMENT, None, html, None)
+    # adds node and its descendants, walking them with a stack of child iterators as ParentNode.to_html does
+    def add_node(self, node):
+        stack = [iter((node,))]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, ParentNode):
+                    if (child.children is None) or (child.children == ""):
+                        raise ValueError("No children; child node is required.")
+                    self.start_parent(child.tag, child.props)
+                    stack.append(iter(child.children))
+                    break
+                elif isinstance(child, LeafNode):
+                    self.add_leaf(child.tag, child.value, child.props)
+                elif isinstance(child, FragmentNode):
+                    self.add_fragment(child.value)
+                else:
+                    self.add_fragment(child.to_html())
+            else:
+                stack.pop()
+                if stack:
+                    self.end_parent()
+    def build(self):
+        if self.open_parents:
+            raise ValueError("Unclosed parent; end_parent is required.")
+        return FlatDocument(
+            self.kinds, self.tag_ids, self.parents, self.next_siblings, self.text_starts, self.text_ends,
+            self.prop_ids, self.tags, self.props, "".join(self.text_parts),
+        )
+
+# like markdown_to_page, but each block's nodes are moved into a FlatDocument as soon as the block is parsed,
+# so only one block's node objects exist at a time; the page's node is the FlatDocument,
+# and its headings are HTMLNode objects, as the title is read from them
+def markdown_to_flat_page(markdown, cache=None):
+    builder = FlatDocumentBuilder()
+    builder.start_parent("div")
+    heading_nodes = []
+    for text, start, end in iter_block_spans(markdown):
+        if (cache is not None) and (text[start] != "#"):
+            block_node = cached_block_node(cache, text, start, end)
+        else:
+            block_node, block_type = span_to_html_node(text, start, end)
+            if block_type == BlockType.HEADING:
+                heading_nodes.append(block_node)
+        builder.add_node(block_node)
+    builder.end_parent()
+    return ParsedPage(builder.build(), heading_nodes)
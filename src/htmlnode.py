@@ -1,5 +1,65 @@
+from functools import lru_cache
 from textnode import *
 
+# translation tables for str.translate: text escapes the characters that would start markup or an entity,
+# attribute values also escape the double quote that delimits them
+TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+ATTRIBUTE_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# most text has nothing to escape, and the in checks that find that out are far cheaper than translate
+# values that are not strings are formatted with str() first, as the f-strings that built tags did
+def escape_text(text):
+    if type(text) is not str:
+        text = str(text)
+    if ("&" in text) or ("<" in text) or (">" in text):
+        return text.translate(TEXT_ESCAPES)
+    return text
+
+def escape_attribute(value):
+    if type(value) is not str:
+        value = str(value)
+    if ("&" in value) or ("<" in value) or (">" in value) or ('"' in value):
+        return value.translate(ATTRIBUTE_ESCAPES)
+    return value
+
+# maps tag names to their open or close tag string, built from pattern the first time a tag is looked up
+# and shared by every node with that tag after that
+class TagTable(dict):
+    def __init__(self, pattern, tags=()):
+        super().__init__()
+        self.pattern = pattern
+        for tag in tags:
+            self[tag]
+    def __missing__(self, tag):
+        tag_string = self.pattern.format(tag)
+        self[tag] = tag_string
+        return tag_string
+
+# the tags markdown pages are made of
+COMMON_TAGS = ("div", "p", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "blockquote", "pre", "code", "b", "i", "a", "img")
+OPEN_TAGS = TagTable("<{}>", COMMON_TAGS)
+CLOSE_TAGS = TagTable("</{}>", COMMON_TAGS)
+
+PROPS_MEMO_SIZE = 1024
+
+def render_props_items(props_items):
+    return "".join([f' {key}="{escape_attribute(value)}"' for key, value in props_items])
+
+# props_items is a tuple of (key, value) pairs of strings; identical props, such as links to the same page,
+# are rendered once and then returned from the memo
+memo_props_items = lru_cache(maxsize=PROPS_MEMO_SIZE)(render_props_items)
+
+def props_html(props):
+    if not props:
+        return ""
+    props_items = tuple(props.items())
+    for key, value in props_items:
+        # memo keys compare by equality, and True == 1 == 1.0 would share one rendering,
+        # so props that are not all strings are rendered without the memo
+        if (type(key) is not str) or (type(value) is not str):
+            return render_props_items(props_items)
+    return memo_props_items(props_items)
+
 # tag is a string representing the HTML tag name, such as "p" or "a" or "h1"
 # tag defaults to None; node without tag renders as raw text
 # value is a string representing the value of the HTML tag, such as the text inside a paragraph
@@ -8,7 +68,10 @@ from textnode import *
 # children defaults to None; node without children is assumed to have a value
 # props is a dictionary of key-value pairs representing the attributes of the HTML tag, such as {"href": "https://www.google.com/"} for an <a> tag
 # props defaults to None; node without props has no additional attributes
+# values and props are plain text, escaped as they are serialized; only FragmentNode holds markup
+# subclasses declare empty __slots__ so that nodes carry no per-instance __dict__
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -16,13 +79,14 @@ class HTMLNode:
         self.props = props
     def to_html(self):
         raise NotImplementedError("This method should be overridden by child classes.")
+    # yields the node's HTML in chunks that join to exactly to_html(), without building the whole string
+    def iter_html(self):
+        yield self.to_html()
+    def write_html(self, fp):
+        for chunk in self.iter_html():
+            fp.write(chunk)
     def props_to_html(self):
-        if self.props == None:
-            return ""
-        formatted_props = ""
-        for key in self.props:
-            formatted_props = formatted_props + ' ' + f'{key}' + '=' + f'"{self.props[key]}"'
-        return formatted_props
+        return props_html(self.props)
     def __eq__(self, other):
         return (
             self.tag == other.tag and
@@ -34,32 +98,72 @@ class HTMLNode:
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props_to_html()})"
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
     def __init__(self, tag=None, value=None, props=None):
         super().__init__(tag, value, "", props)
     def to_html(self):
         if self.value is None:
             raise  ValueError("No value; value is required.")
         elif (self.tag is None) or (self.tag == ""):
-            return self.value
+            return escape_text(self.value)
+        elif self.props:
+            return f'<{self.tag}{props_html(self.props)}>{escape_text(self.value)}{CLOSE_TAGS[self.tag]}'
         else:
-            html_props = super().props_to_html()
-            return f'<{self.tag}{html_props}>{self.value}</{self.tag}>'
+            return OPEN_TAGS[self.tag] + escape_text(self.value) + CLOSE_TAGS[self.tag]
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
     def __init__(self, tag=None, children=None, props=None):
         super().__init__(tag, "", children, props)
-    def to_html(self):
+    def open_tag(self):
         if (self.tag is None) or (self.tag == ""):
             raise ValueError("No tag; tag is required.")
         elif (self.children is None) or (self.children == ""):
             raise ValueError("No children; child node is required.")
+        elif self.props:
+            return f'<{self.tag}{props_html(self.props)}>'
         else:
-            children_html = ''
-            html_props = super().props_to_html()
-            for child in self.children:
-                child_html = f'{child.to_html()}'
-                children_html = children_html + child_html
-            return f'<{self.tag}{html_props}>{children_html}</{self.tag}>'
+            return OPEN_TAGS[self.tag]
+    # walks the tree with an explicit stack of child iterators instead of recursing, so nesting depth is not
+    # limited by the recursion limit; every fragment is appended to one list that is joined once
+    def to_html(self):
+        fragments = [self.open_tag()]
+        append = fragments.append
+        stack = [(iter(self.children), CLOSE_TAGS[self.tag])]
+        while stack:
+            children, close_tag = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    append(child.open_tag())
+                    stack.append((iter(child.children), CLOSE_TAGS[child.tag]))
+                    break
+                append(child.to_html())
+            else:
+                append(close_tag)
+                stack.pop()
+        return "".join(fragments)
+    def iter_html(self):
+        yield self.open_tag()
+        stack = [(iter(self.children), CLOSE_TAGS[self.tag])]
+        while stack:
+            children, close_tag = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    yield child.open_tag()
+                    stack.append((iter(child.children), CLOSE_TAGS[child.tag]))
+                    break
+                yield child.to_html()
+            else:
+                yield close_tag
+                stack.pop()
+
+# html is markup that was already rendered, such as a cached block, and is written out unchanged, without escaping
+class FragmentNode(HTMLNode):
+    __slots__ = ()
+    def __init__(self, html):
+        super().__init__(None, html, "", None)
+    def to_html(self):
+        return self.value
 
 def text_node_to_html_node(text_node):
     validate_type(text_node)
@@ -1,59 +1,300 @@
 import os
-import shutil
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from markdowntohtml import markdown_to_html_node, extract_title
-from htmlnode import HTMLNode
+from markdowntohtml import markdown_to_page, IncrementalPage
+from markdownparsing import TextChunks
+from flattree import markdown_to_flat_page
+from htmlnode import HTMLNode, escape_text
+from buildmanifest import BuildManifest, normalize_path
+from pagetemplate import load_template
+from filesync import file_is_current, copy_file, sync_directory, remove_stale_files
+from watch import SiteWatcher, LiveReloadServer, watch_site
+import profiling
+from profiling import profile_stage, profile_page, enable_profiling, disable_profiling
+from sourceio import read_source
+import blockcache
+from blockcache import enable_block_cache
+from staging import create_staging_directory, remove_staging_directory, publish_directory, live_directory
 
-def clear_directory(directory):
-    if os.path.exists(directory):
-        shutil.rmtree(directory)
+CONTENT_DIR = "./content"
+STATIC_DIR = "./static"
+TEMPLATE_PATH = "./template.html"
+OUTPUT_DIR = "./public"
+MANIFEST_PATH = "./.build-manifest.json"
+PROFILE_PATH = "./build-profile.json"
 
-def copy_directory(source, destination):
-    if not os.path.exists(destination):
-        os.mkdir(destination)
+# copies source, a file or a directory tree, into destination, skipping files whose size and mtime are unchanged
+# returns the set of copied file paths relative to destination
+def copy_directory(source, destination, link=False):
     if os.path.isfile(source):
-        shutil.copy(source, destination)
-    else:
-        contents_list = os.listdir(source)
-        for content in contents_list:
-            content_path = os.path.join(source, content)
-            if os.path.isfile(content_path):
-                shutil.copy(content_path, destination)
-            else:
-                new_destination = os.path.join(destination, content)
-                copy_directory(content_path, new_destination)
+        os.makedirs(destination, exist_ok=True)
+        file_name = os.path.basename(source)
+        destination_path = os.path.join(destination, file_name)
+        if not file_is_current(os.stat(source), destination_path):
+            copy_file(source, destination_path, link)
+        return {file_name}
+    synced_files, _ = sync_directory(source, destination, link)
+    return synced_files
 
-def generate_pages_recursive(content_dir_path, template_path, destination_dir_path):
+# returns a list of (markdown source path, html destination path) pairs for every page under content_dir_path,
+# in the same order the pages were previously generated in
+def collect_pages(content_dir_path, destination_dir_path):
     markdown_extension = ".md"
+    pages = []
     contents_list = os.listdir(content_dir_path)
     for content in contents_list:
         current_content_path = Path(os.path.join(content_dir_path, content))
         current_destination_path = Path(os.path.join(destination_dir_path, content))
         if os.path.isfile(current_content_path) and current_content_path.suffix.lower() == markdown_extension:
-            html_destination_path = current_destination_path.with_suffix(".html")
-            generate_page(current_content_path, template_path, html_destination_path)
+            pages.append((current_content_path, current_destination_path.with_suffix(".html")))
         elif not os.path.isfile(current_content_path):
-            generate_pages_recursive(current_content_path, template_path, current_destination_path)
+            pages.extend(collect_pages(current_content_path, current_destination_path))
+    return pages
+
+class PageGenerationError(Exception):
+    def __init__(self, failures):
+        self.failures = failures
+        lines = [f"{len(failures)} page(s) failed to generate:"]
+        for source_path, error in failures:
+            lines.append(f"  {source_path}: {type(error).__name__}: {error}")
+        super().__init__("\n".join(lines))
+
+# renders every (source, destination) pair in pages; jobs > 1 renders them on a process pool
+# returns the list of successfully generated pairs and a list of (source path, exception) failures
+# incremental_pages optionally maps source paths to the IncrementalPage of their last parse; pages are then
+# generated in this process, reparsing only the blocks that changed since that parse
+def generate_pages(pages, template_path, jobs=1, incremental_pages=None):
+    generated = []
+    failures = []
+    if (jobs <= 1) or (len(pages) <= 1) or (incremental_pages is not None):
+        for from_path, dest_path in pages:
+            try:
+                generate_page(from_path, template_path, dest_path, incremental_pages)
+                generated.append((from_path, dest_path))
+            except Exception as error:
+                failures.append((from_path, error))
+        return generated, failures
+    profiler = profiling.active_profiler
+    cache = blockcache.active_block_cache
+    initializer, initargs = None, ()
+    if cache is not None:
+        # each worker keeps its own in-memory block cache; only the on-disk store is shared between them
+        initializer, initargs = enable_block_cache, (cache.max_entries, cache.directory)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pages)), initializer=initializer, initargs=initargs) as executor:
+        futures = [
+            executor.submit(generate_worker_page, from_path, template_path, dest_path, profiler is not None)
+            for from_path, dest_path in pages
+        ]
+        for page, future in zip(pages, futures):
+            error = future.exception()
+            if error is None:
+                generated.append(page)
+                profile_data, cache_stats = future.result()
+                if profiler is not None:
+                    profiler.merge(profile_data)
+                if cache is not None:
+                    cache.merge(cache_stats)
+            else:
+                failures.append((page[0], error))
+    return generated, failures
 
-def generate_page(from_path, template_path, dest_path):
+# manifest is an optional BuildManifest; when given, pages whose source, template and generator version
+# are unchanged since the last build are skipped, and every page seen is recorded in it
+# output_root is the top-level output directory that manifest output paths are relative to
+# raises PageGenerationError after all other pages are generated if any page fails
+def generate_pages_recursive(content_dir_path, template_path, destination_dir_path, manifest=None, output_root=None, jobs=1, incremental_pages=None):
+    if output_root is None:
+        output_root = destination_dir_path
+    pages = collect_pages(content_dir_path, destination_dir_path)
+    if manifest is not None:
+        template_hash = manifest.file_hash(template_path)
+        pages = [
+            (from_path, dest_path) for from_path, dest_path in pages
+            if not manifest.page_is_current(from_path, dest_path, output_root, template_hash)
+        ]
+    generated, failures = generate_pages(pages, template_path, jobs, incremental_pages)
+    if manifest is not None:
+        for from_path, dest_path in generated:
+            manifest.record_page(from_path, dest_path, output_root, template_hash)
+    if failures:
+        raise PageGenerationError(failures)
+
+def generate_page(from_path, template_path, dest_path, incremental_pages=None):
     print(f"Generating page from {from_path} to {dest_path} using {template_path}.")
-    with open(from_path) as source_file:
-        markdown = source_file.read()
-    with open(template_path) as template_file:
-        template = template_file.read()
-    HTML_node = markdown_to_html_node(markdown)
-    HTML_string = HTML_node.to_html()
-    page_with_content = template.replace("{{ Content }}", HTML_string)
-    title = extract_title(markdown)
-    page_with_title = page_with_content.replace("{{ Title }}", title)
-    destination_directory = os.path.dirname(dest_path)
-    os.makedirs(destination_directory, 0o777, True)
-    with open(dest_path, "w") as destination_file:
-        destination_file.write(page_with_title)
-
-def main():
-    clear_directory("./public")
-    copy_directory("./static", "./public")
-    generate_pages_recursive("./content", "./template.html", "./public")
-
-main()
\ No newline at end of file
+    with profile_page(from_path):
+        with profile_stage("template"):
+            template = load_template(template_path)
+        # large sources are memory-mapped and parsed as they are decoded, so they are never held in memory whole
+        with profile_stage("read"):
+            markdown = read_source(from_path)
+        with profile_stage("parse"):
+            if isinstance(markdown, TextChunks):
+                # large sources become a flat document, which holds far fewer objects than a node tree
+                parsed_page = markdown_to_flat_page(markdown, blockcache.active_block_cache)
+            elif incremental_pages is None:
+                parsed_page = markdown_to_page(markdown, blockcache.active_block_cache)
+            else:
+                incremental_page = incremental_pages.setdefault(normalize_path(from_path), IncrementalPage())
+                parsed_page = incremental_page.parse(markdown, blockcache.active_block_cache)
+            title = escape_text(parsed_page.title)
+        destination_directory = os.path.dirname(dest_path)
+        os.makedirs(destination_directory, 0o777, True)
+        # written beside the destination and renamed over it, so a hardlinked copy of the previous page is never modified
+        temporary_path = f"{dest_path}.tmp"
+        try:
+            with open(temporary_path, "w") as destination_file:
+                content = parsed_page.node.iter_html()
+                output_file = destination_file
+                if profiling.active_profiler is not None:
+                    content = profiling.active_profiler.timed_iter("to_html", content)
+                    output_file = profiling.active_profiler.timed_writer(destination_file)
+                with profile_stage("template"):
+                    template.write(output_file, {"Content": content, "Title": title})
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        with profile_stage("write"):
+            os.replace(temporary_path, dest_path)
+
+# runs generate_page in a pool worker and returns what the parent merges: the data of a profiler of its own
+# when profile is True, and the counts the page added to the worker's block cache when one is active
+def generate_worker_page(from_path, template_path, dest_path, profile=False):
+    cache = blockcache.active_block_cache
+    before = cache.stats() if cache is not None else None
+    profile_data = None
+    if profile:
+        profiler = enable_profiling()
+        try:
+            generate_page(from_path, template_path, dest_path)
+        finally:
+            disable_profiling()
+        profile_data = profiler.to_dict()
+    else:
+        generate_page(from_path, template_path, dest_path)
+    cache_stats = None
+    if cache is not None:
+        after = cache.stats()
+        cache_stats = {name: after[name] - before[name] for name in after}
+    return profile_data, cache_stats
+
+def page_destination(source_path, content_dir_path, destination_dir_path):
+    relative_path = os.path.relpath(source_path, content_dir_path)
+    return Path(os.path.join(destination_dir_path, relative_path)).with_suffix(".html")
+
+def sync_static(manifest, output_dir, link_static=False):
+    static_files = copy_directory(STATIC_DIR, output_dir, link_static)
+    for relative_path in remove_stale_files(output_dir, manifest.static_files, static_files):
+        print(f"Removed deleted static file {relative_path}.")
+    manifest.static_files = sorted(static_files)
+
+def build_site(manifest, output_dir, jobs=1, link_static=False):
+    with profile_stage("static_copy"):
+        sync_static(manifest, output_dir, link_static)
+    generate_pages_recursive(CONTENT_DIR, TEMPLATE_PATH, output_dir, manifest, jobs=jobs)
+    for source in manifest.remove_stale_pages(output_dir):
+        print(f"Removed output of deleted page {source}.")
+
+# applies a watch.ChangeSet: a template change rebuilds every page, a content change rebuilds only that page
+# returns False, after reporting the error, when the rebuild failed
+# incremental_pages keeps the last parse of each page rebuilt for a content change, see generate_pages
+def rebuild_changes(changes, manifest, link_static=False, incremental_pages=None):
+    try:
+        if changes.static_changed:
+            sync_static(manifest, OUTPUT_DIR, link_static)
+        for source in changes.content_removed:
+            manifest.remove_page(source, OUTPUT_DIR)
+            if incremental_pages is not None:
+                incremental_pages.pop(normalize_path(source), None)
+            print(f"Removed output of deleted page {source}.")
+        if changes.template_changed:
+            # a template change leaves every page's content as it was, so no parse state is kept for these rebuilds;
+            # holding it for every page would keep the whole site's node trees in memory for the session
+            generate_pages_recursive(CONTENT_DIR, TEMPLATE_PATH, OUTPUT_DIR, manifest)
+        elif changes.content_changed:
+            pages = [(Path(source), page_destination(source, CONTENT_DIR, OUTPUT_DIR)) for source in changes.content_changed]
+            generated, failures = generate_pages(pages, TEMPLATE_PATH, incremental_pages=incremental_pages)
+            template_hash = manifest.file_hash(TEMPLATE_PATH)
+            for from_path, dest_path in generated:
+                manifest.record_page(from_path, dest_path, OUTPUT_DIR, template_hash)
+            if failures:
+                raise PageGenerationError(failures)
+    except Exception as error:
+        print(error, file=sys.stderr)
+        return False
+    finally:
+        manifest.save()
+    return True
+
+def watch(manifest, port, link_static=False):
+    watcher = SiteWatcher(CONTENT_DIR, STATIC_DIR, TEMPLATE_PATH)
+    server = LiveReloadServer(OUTPUT_DIR, port)
+    server.start()
+    print(f"Serving {OUTPUT_DIR} at http://localhost:{port}/ and watching for changes.")
+    incremental_pages = {}
+    watch_site(watcher, lambda changes: rebuild_changes(changes, manifest, link_static, incremental_pages), server)
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Build the static site into ./public.")
+    parser.add_argument("command", nargs="?", choices=["build", "watch"], default="build", help="build once, or build then serve and rebuild on changes")
+    parser.add_argument("--clean", action="store_true", help="discard previous output and rebuild every page")
+    parser.add_argument("--link-static", action="store_true", help="hardlink static files into ./public instead of copying them")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of processes rendering pages; 0 uses every CPU core")
+    parser.add_argument("--profile", action="store_true", help="time each build stage and report per-page and total timings")
+    parser.add_argument("--profile-output", default=PROFILE_PATH, help="where --profile writes its JSON report")
+    parser.add_argument("--block-cache", type=int, default=0, metavar="ENTRIES", help="reuse the HTML of blocks repeated across pages, keeping up to ENTRIES blocks in memory")
+    parser.add_argument("--block-cache-dir", help="also keep cached blocks in this directory, shared between builds and --jobs workers")
+    parser.add_argument("--port", type=int, default=8888, help="port served by the watch command")
+    arguments = parser.parse_args(argv)
+    if arguments.jobs < 0:
+        parser.error("--jobs must be zero or a positive number")
+    if arguments.jobs == 0:
+        arguments.jobs = os.cpu_count() or 1
+    if arguments.block_cache < 0:
+        parser.error("--block-cache must be zero or a positive number")
+    if (arguments.block_cache_dir is not None) and (arguments.block_cache == 0):
+        arguments.block_cache = blockcache.DEFAULT_MAX_ENTRIES
+    return arguments
+
+# builds into a staging directory and publishes it only if every page was generated,
+# so a failed build leaves the previous output in place
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    if arguments.clean:
+        manifest = BuildManifest(MANIFEST_PATH)
+    else:
+        manifest = BuildManifest.load(MANIFEST_PATH)
+    staging_dir = create_staging_directory(OUTPUT_DIR, reuse_previous=not arguments.clean)
+    if arguments.profile:
+        enable_profiling()
+    if arguments.block_cache > 0:
+        enable_block_cache(arguments.block_cache, arguments.block_cache_dir)
+    try:
+        build_site(manifest, staging_dir, arguments.jobs, arguments.link_static)
+    except BaseException as error:
+        remove_staging_directory(staging_dir)
+        if not isinstance(error, PageGenerationError):
+            raise
+        print(error, file=sys.stderr)
+        print(f"Build failed; {OUTPUT_DIR} was left unchanged.", file=sys.stderr)
+        if (arguments.command == "build") or (live_directory(OUTPUT_DIR) is None):
+            sys.exit(1)
+    else:
+        publish_directory(staging_dir, OUTPUT_DIR)
+        manifest.save()
+    finally:
+        if arguments.profile:
+            profiler = disable_profiling()
+            profiler.write_json(arguments.profile_output)
+            print(profiler.summary())
+            print(f"Wrote build profile to {arguments.profile_output}.")
+        cache = blockcache.active_block_cache
+        if cache is not None:
+            print(cache.summary())
+    if arguments.command == "watch":
+        manifest = BuildManifest.load(MANIFEST_PATH)
+        watch(manifest, arguments.port, arguments.link_static)
+
+if __name__ == "__main__":
+    main()
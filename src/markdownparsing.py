@@ -1,5 +1,11 @@
 import re
 from enum import Enum
+import profiling
+from profiling import profile_stage, profile_iter
+
+class SpanType(Enum):
+    IMAGE = "image"
+    LINK = "link"
 
 class BlockType(Enum):
     HEADING = "heading"
@@ -9,22 +15,22 @@ class BlockType(Enum):
     ORDERED = "ordered"
     PARAGRAPH = "paragraph"
 
+QUOTE_LINE_PATTERN = re.compile(r">(.*)")
+UNORDERED_LINE_PATTERN = re.compile(r"(\*|-)(\s.*)")
+ORDERED_LINE_PATTERN = re.compile(r"\d\.(\s.*)")
+
 def is_heading_block(block):
-    if re.search(r"^(#{1,6})", block):
-        return True
-    else:
-        return False
+    return block.startswith("#")
 
+# the closing fence may be followed by one trailing newline, as with the "$" anchor this replaced
 def is_code_block(block):
-    begins_block = re.search(r"^(```)", block)
-    ends_block = re.search(r"(```)$", block)
-    return all([begins_block, ends_block])
+    return block.startswith("```") and (block.endswith("```") or block.endswith("```\n"))
 
 def is_quote_block(block_lines):
-    return all(re.fullmatch(r">(.*)", line) is not None for line in block_lines)
+    return all(QUOTE_LINE_PATTERN.fullmatch(line) is not None for line in block_lines)
 
 def is_unordered_list_block(block_lines):
-    return all(re.fullmatch(r"(\*|-)(\s.*)", line) is not None for line in block_lines)
+    return all(UNORDERED_LINE_PATTERN.fullmatch(line) is not None for line in block_lines)
 
 def check_ordered_list_sequence(block_lines):
     sequence_booleans = []
@@ -42,10 +48,41 @@ def check_ordered_list_sequence(block_lines):
         next_item_number += 1
     return all(sequence_booleans)
 
+# checks the item pattern and the 1, 2, 3... numbering in the same pass over the lines
 def is_ordered_list_block(block_lines):
-    all_ordered_list_items = all(re.fullmatch(r"\d\.(\s.*)", line) is not None for line in block_lines)
-    all_in_sequence = check_ordered_list_sequence(block_lines)
-    return all([all_ordered_list_items, all_in_sequence])
+    for item_number, line in enumerate(block_lines, 1):
+        if ORDERED_LINE_PATTERN.fullmatch(line) is None:
+            return False
+        if int(line[0]) != item_number:
+            return False
+    return True
+
+# finds images and links in one scan: the named groups of the alternative that matched give the span's type
+# every match starts at a "!" or "[", which the regex engine can skip to directly; the first alternative only
+# continues after a "!" and the second only after a "[" that does not follow a "!", since that one belongs to an image
+# a link whose url holds the start of an image, as in "[a](![b)](c)", does not match, so the image is found instead,
+# as when images were split out first
+MARKDOWN_SPAN_PATTERN = re.compile(
+    r"[!\[](?:"
+    r"(?<=!)\[(?P<image_text>[^\[\]]*)\]\((?P<image_url>[^\(\)]*)\)"
+    r"|(?<=\[)(?<!!\[)(?P<link_text>[^\[\]]*)\]\((?P<link_url>[^\(\)!]*(?:!(?!\[[^\[\]]*\]\([^\(\)]*\))[^\(\)!]*)*)\)"
+    r")"
+)
+
+# yields (span_type, text, url, start, end) for each image and link in text[start:end], in source order
+def iter_markdown_spans(text, start=0, end=None):
+    if end is None:
+        end = len(text)
+    for match in MARKDOWN_SPAN_PATTERN.finditer(text, start, end):
+        image_text, image_url, link_text, link_url = match.groups()
+        span_start, span_end = match.span()
+        if image_url is not None:
+            yield SpanType.IMAGE, image_text, image_url, span_start, span_end
+        else:
+            yield SpanType.LINK, link_text, link_url, span_start, span_end
+
+def extract_markdown_spans(text):
+    return list(iter_markdown_spans(text))
 
 def extract_markdown_images(text):
     extracted_images = re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
@@ -55,26 +92,130 @@ def extract_markdown_links(text):
     extracted_links = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
     return extracted_links
 
+# matches exactly the characters for which str.isalnum() is true
+ALNUM_PATTERN = re.compile(r"[^\W_]")
+
+# blocks and lines are handled as (start, end) spans into one source string, so no text is copied until a
+# leaf node needs it; strip_span narrows a span the way text[start:end].strip() would
+def strip_span(text, start, end):
+    while (start < end) and text[start].isspace():
+        start += 1
+    while (end > start) and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def split_line_spans(text, start, end):
+    line_spans = []
+    line_end = text.find("\n", start, end)
+    while line_end != -1:
+        line_spans.append((start, line_end))
+        start = line_end + 1
+        line_end = text.find("\n", start, end)
+    line_spans.append((start, end))
+    return line_spans
+
+# splits on "\n\n" exactly as markdown.split("\n\n") would: a line that is only "\n" ends the block before it,
+# together with the previous line's newline, and the next block starts after it
+def split_block_lines(lines):
+    block_lines = []
+    for line in lines:
+        if (line == "\n") and block_lines:
+            yield "".join(block_lines)[:-1]
+            block_lines = []
+        else:
+            block_lines.append(line)
+    yield "".join(block_lines)
+
+def split_text_chunks(text):
+    start = 0
+    end = text.find("\n\n")
+    while end != -1:
+        yield text, start, end
+        start = end + 2
+        end = text.find("\n\n", start)
+    yield text, start, len(text)
+
+# an iterable of strings that each end where a block ends, such as sourceio reads from large files;
+# each string is split into blocks whole rather than treated as a single line
+class TextChunks:
+    def __init__(self, chunks):
+        self.chunks = chunks
+    def __iter__(self):
+        return iter(self.chunks)
+
+def split_block_spans(markdown):
+    if isinstance(markdown, str):
+        chunks = split_text_chunks(markdown)
+    elif isinstance(markdown, TextChunks):
+        chunks = (span for chunk in markdown for span in split_text_chunks(chunk))
+    else:
+        chunks = ((chunk, 0, len(chunk)) for chunk in split_block_lines(markdown))
+    for text, start, end in chunks:
+        start, end = strip_span(text, start, end)
+        if ALNUM_PATTERN.search(text, start, end) is not None:
+            yield text, start, end
+
+# markdown is either the whole document as a string, TextChunks, or an iterable of its lines, newlines included,
+# such as an open file; blocks are read lazily, so only the current block or chunk is held in memory
+# yields (text, start, end) for every block, text[start:end] being the stripped block: spans index the whole
+# document when it is a string, each chunk for TextChunks, and each block's own text when reading lines
+def iter_block_spans(markdown):
+    return profile_iter("markdown_to_blocks", split_block_spans(markdown))
+
+def iter_markdown_blocks(markdown):
+    return (text[start:end] for text, start, end in iter_block_spans(markdown))
+
 def markdown_to_blocks(markdown):
-    blocks_with_chads = markdown.split("\n\n")
-    blocks = []
-    for block in blocks_with_chads:
-        block_without_chads = block.strip("\n").strip()
-        if any(char.isalnum() for char in block):
-            blocks.append(block_without_chads)
-    return blocks
+    return list(iter_markdown_blocks(markdown))
+
+def lines_match(pattern, text, line_spans):
+    return all(pattern.fullmatch(text, start, end) is not None for start, end in line_spans)
+
+def is_ordered_list_span(text, line_spans):
+    for item_number, (start, end) in enumerate(line_spans, 1):
+        if ORDERED_LINE_PATTERN.fullmatch(text, start, end) is None:
+            return False
+        if int(text[start]) != item_number:
+            return False
+    return True
+
+# classifies the block text[start:end] by its first character, so at most one block pattern is tried per block
+# returns the block type and, for quotes and lists, the spans of the block's lines so callers need not split it again
+def find_span_type(text, start, end):
+    first_char = text[start] if start < end else ""
+    if first_char == "#":
+        return BlockType.HEADING, None
+    elif first_char == "`":
+        if text.startswith("```", start, end) and (text.endswith("```", start, end) or text.endswith("```\n", start, end)):
+            return BlockType.CODE, None
+    elif first_char == ">":
+        line_spans = split_line_spans(text, start, end)
+        if lines_match(QUOTE_LINE_PATTERN, text, line_spans):
+            return BlockType.QUOTE, line_spans
+    elif (first_char == "*") or (first_char == "-"):
+        line_spans = split_line_spans(text, start, end)
+        if lines_match(UNORDERED_LINE_PATTERN, text, line_spans):
+            return BlockType.UNORDERED, line_spans
+    elif first_char.isdecimal():
+        line_spans = split_line_spans(text, start, end)
+        if is_ordered_list_span(text, line_spans):
+            return BlockType.ORDERED, line_spans
+    return BlockType.PARAGRAPH, None
+
+# the stage is only entered while profiling, so a build without it pays one check per block
+def classify_span(text, start, end):
+    if profiling.active_profiler is None:
+        return find_span_type(text, start, end)
+    with profile_stage("block_to_block_type"):
+        return find_span_type(text, start, end)
+
+# returns the block type and, for quotes and lists, the block's lines
+def classify_block(block):
+    block_type, line_spans = classify_span(block, 0, len(block))
+    if line_spans is None:
+        return block_type, None
+    return block_type, [block[start:end] for start, end in line_spans]
 
 def block_to_block_type(block):
-    block_lines = block.split("\n")
-    if is_heading_block(block):
-        return BlockType.HEADING
-    elif is_code_block(block):
-        return BlockType.CODE
-    elif is_quote_block(block_lines):
-        return BlockType.QUOTE
-    elif is_unordered_list_block(block_lines):
-        return BlockType.UNORDERED
-    elif is_ordered_list_block(block_lines):
-        return BlockType.ORDERED
-    else:
-        return BlockType.PARAGRAPH
\ No newline at end of file
+    block_type, line_spans = classify_span(block, 0, len(block))
+    return block_type
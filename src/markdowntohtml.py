@@ -1,3 +1,4 @@
+import hashlib
 from markdownparsing import *
 from textparsing import *
 from textnode import *
@@ -14,86 +15,99 @@ def text_to_inline_nodes(tag, raw_value):
     else:
         return ParentNode(tag, inline_nodes)
 
-def block_to_heading(block):
-    heading_count = block.count("#", 0, 6)
+# the span_to_* builders read the block text[start:end], or its lines given as spans into text,
+# and slice out only the raw text each leaf needs
+def span_to_heading(text, start, end):
+    heading_count = text.count("#", start, min(start + 6, end))
     tag = f"h{heading_count}"
-    raw_value = block[heading_count:].strip()
-    node = text_to_inline_nodes(tag, raw_value)
+    raw_start, raw_end = strip_span(text, start + heading_count, end)
+    node = text_to_inline_nodes(tag, text[raw_start:raw_end])
     return node
 
-def block_to_code(block):
+def span_to_code(text, start, end):
     tag = "code"
-    raw_value = block.strip("```").rstrip("```").strip()
-    secondary_node = text_to_inline_nodes(tag, raw_value)
+    while (start < end) and (text[start] == "`"):
+        start += 1
+    while (end > start) and (text[end - 1] == "`"):
+        end -= 1
+    raw_start, raw_end = strip_span(text, start, end)
+    secondary_node = text_to_inline_nodes(tag, text[raw_start:raw_end])
     node = ParentNode("pre", [secondary_node])
     return node
 
-def block_to_quote(block_lines):
+def span_to_quote(text, line_spans):
     tag = "blockquote"
-    raw_value = ""
-    for line in block_lines:
-        stripped_line = line[1:].strip()
-        raw_value += f"{stripped_line}\n"
-    node = text_to_inline_nodes(tag, raw_value.rstrip("\n"))
+    stripped_lines = []
+    for start, end in line_spans:
+        raw_start, raw_end = strip_span(text, start + 1, end)
+        stripped_lines.append(text[raw_start:raw_end])
+    node = text_to_inline_nodes(tag, "\n".join(stripped_lines).rstrip("\n"))
     return node
 
-def block_to_unordered(block_lines):
-    tag = "li"
+def span_to_list(tag, marker_length, text, line_spans):
     item_nodes = []
-    for line in block_lines:
-        raw_value = line[2:].strip()
-        inner_node = text_to_inline_nodes(tag, raw_value)
+    for start, end in line_spans:
+        raw_start, raw_end = strip_span(text, min(start + marker_length, end), end)
+        inner_node = text_to_inline_nodes("li", text[raw_start:raw_end])
         item_nodes.append(inner_node)
-    node = ParentNode("ul", item_nodes)
+    node = ParentNode(tag, item_nodes)
     return node
 
-def block_to_ordered(block_lines):
-    tag = "li"
-    item_nodes = []
-    for line in block_lines:
-        raw_value = line[3:].strip()
-        inner_node = text_to_inline_nodes(tag, raw_value)
-        item_nodes.append(inner_node)
-    node = ParentNode("ol", item_nodes)
-    return node
+def span_to_unordered(text, line_spans):
+    return span_to_list("ul", 2, text, line_spans)
 
-def block_to_paragraph(block):
+def span_to_ordered(text, line_spans):
+    return span_to_list("ol", 3, text, line_spans)
+
+def span_to_paragraph(text, start, end):
     tag = "p"
-    raw_value = block
+    raw_value = text[start:end]
     node = text_to_inline_nodes(tag, raw_value)
     return node
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    block_nodes = []
-    for block in blocks:
-        block_lines = block.split("\n")
-        block_type = block_to_block_type(block)
-        if block_type == BlockType.HEADING:
-            block_node = block_to_heading(block)
-        elif block_type == BlockType.CODE:
-            block_node = block_to_code(block)
-        elif block_type == BlockType.QUOTE:
-            block_node = block_to_quote(block_lines)
-        elif block_type == BlockType.UNORDERED:
-            block_node = block_to_unordered(block_lines)
-        elif block_type == BlockType.ORDERED:
-            block_node = block_to_ordered(block_lines)
-        elif block_type == BlockType.PARAGRAPH:
-            block_node = block_to_paragraph(block)
-        block_nodes.append(block_node)
-    HTML_node = ParentNode("div", block_nodes)
-    return HTML_node
+def span_to_html_node(text, start, end):
+    block_type, line_spans = classify_span(text, start, end)
+    if block_type == BlockType.HEADING:
+        block_node = span_to_heading(text, start, end)
+    elif block_type == BlockType.CODE:
+        block_node = span_to_code(text, start, end)
+    elif block_type == BlockType.QUOTE:
+        block_node = span_to_quote(text, line_spans)
+    elif block_type == BlockType.UNORDERED:
+        block_node = span_to_unordered(text, line_spans)
+    elif block_type == BlockType.ORDERED:
+        block_node = span_to_ordered(text, line_spans)
+    elif block_type == BlockType.PARAGRAPH:
+        block_node = span_to_paragraph(text, start, end)
+    return block_node, block_type
 
-def extract_title(markdown):
-    heading_nodes = []
+def lines_to_spans(block_lines):
+    text = "\n".join(block_lines)
+    return text, split_line_spans(text, 0, len(text))
+
+def block_to_heading(block):
+    return span_to_heading(block, 0, len(block))
+
+def block_to_code(block):
+    return span_to_code(block, 0, len(block))
+
+def block_to_quote(block_lines):
+    return span_to_quote(*lines_to_spans(block_lines))
+
+def block_to_unordered(block_lines):
+    return span_to_unordered(*lines_to_spans(block_lines))
+
+def block_to_ordered(block_lines):
+    return span_to_ordered(*lines_to_spans(block_lines))
+
+def block_to_paragraph(block):
+    return span_to_paragraph(block, 0, len(block))
+
+def block_to_html_node(block):
+    return span_to_html_node(block, 0, len(block))
+
+def title_from_headings(heading_nodes):
     title_node = []
-    blocks = markdown_to_blocks(markdown)
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        if block_type == BlockType.HEADING:
-            block_node = block_to_heading(block)
-            heading_nodes.append(block_node)
     for node in heading_nodes:
         if node.tag == "h1":
             title_node.append(node)
@@ -102,4 +116,91 @@ def extract_title(markdown):
     elif len(title_node) > 1:
         raise Exception("Multiple title headings.")
     else:
-        return title_node[0].value
\ No newline at end of file
+        return title_node[0].value
+
+# node is the "div" ParentNode holding every block of the page
+# headings is the list of heading nodes of the page, in document order
+# title is the value of the page's only h1 heading; reading it raises if there is no h1 or more than one
+class ParsedPage:
+    def __init__(self, node, headings):
+        self.node = node
+        self.headings = headings
+    @property
+    def title(self):
+        return title_from_headings(self.headings)
+    def __repr__(self):
+        return f"ParsedPage({self.node}, {self.headings})"
+
+# returns a FragmentNode holding the block's HTML, rendering it only if cache does not have it yet
+def cached_block_node(cache, text, start, end):
+    block = text[start:end]
+    fragment = cache.get(block)
+    if fragment is None:
+        block_node, block_type = span_to_html_node(text, start, end)
+        fragment = block_node.to_html()
+        cache.put(block, fragment)
+    return FragmentNode(fragment)
+
+# parses the page once, collecting heading metadata while building the HTML tree
+# markdown may be a string or an iterable of lines such as an open file, which is then read one block at a time
+# cache is an optional blockcache.BlockCache; cached blocks appear in the tree as FragmentNodes,
+# except headings, which are always parsed since the page title is read from their nodes
+def markdown_to_page(markdown, cache=None):
+    block_nodes = []
+    heading_nodes = []
+    for text, start, end in iter_block_spans(markdown):
+        if (cache is not None) and (text[start] != "#"):
+            block_nodes.append(cached_block_node(cache, text, start, end))
+            continue
+        block_node, block_type = span_to_html_node(text, start, end)
+        if block_type == BlockType.HEADING:
+            heading_nodes.append(block_node)
+        block_nodes.append(block_node)
+    HTML_node = ParentNode("div", block_nodes)
+    return ParsedPage(HTML_node, heading_nodes)
+
+# keeps the blocks of the last parse of one page, keyed by the sha256 of each block's text, so parsing an edited
+# version of the page only classifies and renders the blocks that were added or changed; every other block
+# reuses its node from the previous parse, and the time taken scales with the size of the edit
+# reparsed and reused count the blocks rendered and the blocks taken from the previous parse by the last parse
+class IncrementalPage:
+    def __init__(self):
+        self.blocks = {}
+        self.reparsed = 0
+        self.reused = 0
+    def parse(self, markdown, cache=None):
+        blocks = {}
+        block_nodes = []
+        heading_nodes = []
+        self.reparsed = 0
+        self.reused = 0
+        for text, start, end in iter_block_spans(markdown):
+            key = hashlib.sha256(text[start:end].encode()).digest()
+            entry = blocks.get(key) or self.blocks.get(key)
+            if entry is not None:
+                self.reused += 1
+            elif (cache is not None) and (text[start] != "#"):
+                entry = (cached_block_node(cache, text, start, end), None)
+                self.reparsed += 1
+            else:
+                entry = span_to_html_node(text, start, end)
+                self.reparsed += 1
+            blocks[key] = entry
+            block_node, block_type = entry
+            if block_type == BlockType.HEADING:
+                heading_nodes.append(block_node)
+            block_nodes.append(block_node)
+        self.blocks = blocks
+        return ParsedPage(ParentNode("div", block_nodes), heading_nodes)
+
+def markdown_to_html_node(markdown, cache=None):
+    return markdown_to_page(markdown, cache).node
+
+def extract_title(markdown):
+    heading_nodes = []
+    for text, start, end in iter_block_spans(markdown):
+        block_type, line_spans = classify_span(text, start, end)
+        if block_type == BlockType.HEADING:
+            block_node = span_to_heading(text, start, end)
+            heading_nodes.append(block_node)
+    return title_from_headings(heading_nodes)
@@ -0,0 +1,74 @@
+import os
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (\w+) \}\}")
+WRITE_CHUNK_SIZE = 64 * 1024
+
+# segments is a list alternating between literal template text and placeholder names:
+# even indices are literal strings (possibly empty), odd indices are slot names such as "Content" or "Title"
+class CompiledTemplate:
+    def __init__(self, segments):
+        self.segments = segments
+    @classmethod
+    def compile(cls, template):
+        segments = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(template):
+            segments.append(template[position:match.start()])
+            segments.append(match.group(1))
+            position = match.end()
+        segments.append(template[position:])
+        return cls(segments)
+    # values maps slot names to strings; slots without a value keep their placeholder text
+    def render(self, values):
+        parts = self.segments[:]
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            if name in values:
+                parts[index] = values[name]
+            else:
+                parts[index] = f"{{{{ {name} }}}}"
+        return "".join(parts)
+    # like render, but a value may also be an iterable of string chunks, such as HTMLNode.iter_html(),
+    # which is consumed by the first slot it fills;
+    # chunks are gathered into writes of about WRITE_CHUNK_SIZE characters
+    def write(self, fp, values):
+        pending = []
+        pending_size = 0
+        for chunk in self.iter_render(values):
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= WRITE_CHUNK_SIZE:
+                fp.write("".join(pending))
+                pending = []
+                pending_size = 0
+        if pending:
+            fp.write("".join(pending))
+    def iter_render(self, values):
+        for index, segment in enumerate(self.segments):
+            if index % 2 == 0:
+                yield segment
+            elif segment not in values:
+                yield f"{{{{ {segment} }}}}"
+            elif isinstance(values[segment], str):
+                yield values[segment]
+            else:
+                yield from values[segment]
+    def __eq__(self, other):
+        return self.segments == other.segments
+    def __repr__(self):
+        return f"CompiledTemplate({self.segments})"
+
+# compiled templates keyed by path, each stored with the size and mtime of the file it was compiled from
+template_cache = {}
+
+def load_template(template_path):
+    key = os.path.abspath(template_path)
+    stat = os.stat(key)
+    cached = template_cache.get(key)
+    if (cached is not None) and (cached[0] == stat.st_mtime_ns) and (cached[1] == stat.st_size):
+        return cached[2]
+    with open(key) as template_file:
+        template = CompiledTemplate.compile(template_file.read())
+    template_cache[key] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
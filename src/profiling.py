@@ -0,0 +1,178 @@
+import json
+import time
+
+# pipeline stages in the order a build runs them; reports list stages in this order
+STAGES = [
+    "read",
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "text_to_text_nodes",
+    "parse",
+    "to_html",
+    "template",
+    "write",
+    "static_copy",
+]
+
+# every stage records exclusive time: time spent in a stage nested inside another is only counted once,
+# for the inner stage, so stage totals add up to the profiled wall time
+# stage_times and stage_calls map stage names to total seconds and number of calls across the build
+# page_times maps page paths to the seconds each stage took while rendering that page
+class BuildProfiler:
+    def __init__(self):
+        self.stage_times = {}
+        self.stage_calls = {}
+        self.page_times = {}
+        self.current_page = None
+        self.stack = []
+    def start(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+    def stop(self):
+        name, started, nested_time = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        self.add(name, elapsed - nested_time)
+    def add(self, name, seconds, calls=1, page=None):
+        self.stage_times[name] = self.stage_times.get(name, 0.0) + seconds
+        self.stage_calls[name] = self.stage_calls.get(name, 0) + calls
+        if page is None:
+            page = self.current_page
+        if page is not None:
+            page_stages = self.page_times.setdefault(page, {})
+            page_stages[name] = page_stages.get(name, 0.0) + seconds
+    def stage(self, name):
+        return ProfiledStage(self, name)
+    def page(self, path):
+        return ProfiledPage(self, str(path))
+    # wraps an iterator so the time spent producing each item is recorded under name
+    def timed_iter(self, name, iterator):
+        iterator = iter(iterator)
+        while True:
+            self.start(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.stop()
+            yield item
+    def timed_writer(self, fp):
+        return ProfiledWriter(self, fp)
+    def merge(self, data):
+        for name, stage_data in data["stages"].items():
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + stage_data["seconds"]
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + stage_data["calls"]
+        for page, page_stages in data["pages"].items():
+            merged_stages = self.page_times.setdefault(page, {})
+            for name, seconds in page_stages.items():
+                # to_dict adds each page's total next to its stages; it is recomputed, not merged
+                if name == "total":
+                    continue
+                merged_stages[name] = merged_stages.get(name, 0.0) + seconds
+    def ordered_stages(self):
+        known = [name for name in STAGES if name in self.stage_times]
+        return known + sorted(name for name in self.stage_times if name not in STAGES)
+    def to_dict(self):
+        return {
+            "stages": {
+                name: {"seconds": self.stage_times[name], "calls": self.stage_calls[name]}
+                for name in self.ordered_stages()
+            },
+            "pages": {
+                page: dict(page_stages, total=sum(page_stages.values()))
+                for page, page_stages in sorted(self.page_times.items())
+            },
+        }
+    def write_json(self, path):
+        with open(path, "w") as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=1)
+    def summary(self, top=10):
+        total = sum(self.stage_times.values())
+        lines = [f"Profiled {total * 1000:.1f} ms across {len(self.page_times)} page(s)."]
+        lines.append("Stages:")
+        for name in sorted(self.ordered_stages(), key=lambda name: -self.stage_times[name])[:top]:
+            seconds = self.stage_times[name]
+            share = (seconds / total * 100) if total else 0.0
+            lines.append(f"  {name:<20} {seconds * 1000:10.2f} ms {share:6.1f}% {self.stage_calls[name]:>9} calls")
+        if self.page_times:
+            lines.append("Slowest pages:")
+            page_totals = sorted(((sum(stages.values()), page) for page, stages in self.page_times.items()), reverse=True)
+            for seconds, page in page_totals[:top]:
+                lines.append(f"  {seconds * 1000:10.2f} ms {page}")
+        return "\n".join(lines)
+
+class ProfiledStage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+    def __enter__(self):
+        self.profiler.start(self.name)
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.stop()
+        return False
+
+class ProfiledPage:
+    def __init__(self, profiler, path):
+        self.profiler = profiler
+        self.path = path
+        self.previous_page = None
+    def __enter__(self):
+        self.previous_page = self.profiler.current_page
+        self.profiler.current_page = self.path
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.current_page = self.previous_page
+        return False
+
+# forwards write calls to fp, recording their time under the "write" stage
+class ProfiledWriter:
+    def __init__(self, profiler, fp):
+        self.profiler = profiler
+        self.fp = fp
+    def write(self, text):
+        self.profiler.start("write")
+        try:
+            return self.fp.write(text)
+        finally:
+            self.profiler.stop()
+
+# shared do-nothing context returned while profiling is off, so instrumented code pays one call and one check
+class NullStage:
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+NULL_STAGE = NullStage()
+
+# the profiler recording the current build, or None when profiling is off
+active_profiler = None
+
+def enable_profiling():
+    global active_profiler
+    active_profiler = BuildProfiler()
+    return active_profiler
+
+def disable_profiling():
+    global active_profiler
+    profiler = active_profiler
+    active_profiler = None
+    return profiler
+
+def profile_stage(name):
+    if active_profiler is None:
+        return NULL_STAGE
+    return active_profiler.stage(name)
+
+def profile_page(path):
+    if active_profiler is None:
+        return NULL_STAGE
+    return active_profiler.page(path)
+
+# for generators, whose time cannot be measured by a stage wrapped around their body
+def profile_iter(name, iterator):
+    if active_profiler is None:
+        return iterator
+    return active_profiler.timed_iter(name, iterator)
@@ -0,0 +1,43 @@
+import codecs
+import io
+import locale
+import mmap
+import os
+from markdownparsing import TextChunks
+from profiling import profile_iter
+
+# sources of at least this many bytes are memory-mapped and decoded a chunk at a time, so memory scales with
+# the chunk size rather than the file; smaller sources are read whole, which is faster (see bench_source_io.py)
+MMAP_THRESHOLD = 4 * 1024 * 1024
+DECODE_CHUNK_SIZE = 1024 * 1024
+
+# decodes the mapped file chunk_size bytes at a time, translating newlines as open() does in text mode,
+# and yields the decoded text cut at the last blank line of each chunk, so every string ends where a block ends;
+# a block longer than a chunk is collected across chunks until a blank line follows it
+def iter_mapped_chunks(path, encoding=None, chunk_size=DECODE_CHUNK_SIZE):
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+    with open(path, "rb") as source_file:
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            pending = []
+            for offset in range(0, len(mapped), chunk_size):
+                piece = decoder.decode(mapped[offset:offset + chunk_size])
+                boundary = piece.rfind("\n\n")
+                if boundary == -1:
+                    pending.append(piece)
+                    continue
+                pending.append(piece[:boundary])
+                yield "".join(pending)
+                pending = [piece[boundary + 2:]]
+    pending.append(decoder.decode(b"", final=True))
+    yield "".join(pending)
+
+# returns the markdown of the source at path for markdown_to_page: a string for small files,
+# TextChunks read from a memory map for files of threshold bytes or more
+def read_source(path, threshold=MMAP_THRESHOLD, encoding=None):
+    size = os.path.getsize(path)
+    if (size == 0) or (size < threshold):
+        with open(path, encoding=encoding) as source_file:
+            return source_file.read()
+    return TextChunks(profile_iter("read", iter_mapped_chunks(path, encoding)))
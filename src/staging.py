@@ -0,0 +1,79 @@
+import os
+import shutil
+import time
+from filesync import link_tree
+
+# the live output path is a symlink to a build directory next to it, named .<output name>-<build id>;
+# each build writes a new build directory and swaps the symlink with a single atomic rename
+# the build replaced by the last publish is kept, behind a .<output name>.previous symlink, until the next
+# publish, so requests already resolving paths inside it can still be answered
+
+def build_directory_prefix(output_dir):
+    parent, name = os.path.split(os.path.normpath(output_dir))
+    return os.path.join(parent, f".{name}-")
+
+def previous_link_path(output_dir):
+    parent, name = os.path.split(os.path.normpath(output_dir))
+    return os.path.join(parent, f".{name}.previous")
+
+# returns the directory currently served at output_dir, or None if there is no output yet
+def live_directory(output_dir):
+    if os.path.islink(output_dir):
+        return os.path.realpath(output_dir)
+    if os.path.isdir(output_dir):
+        return os.path.abspath(output_dir)
+    return None
+
+# returns the build directory the last publish replaced, or None if it was not kept
+def previous_directory(output_dir):
+    previous_link = previous_link_path(output_dir)
+    if os.path.islink(previous_link):
+        return os.path.realpath(previous_link)
+    return None
+
+# removes build directories left behind by interrupted builds and builds older than the previous one
+def remove_abandoned_builds(output_dir):
+    prefix = build_directory_prefix(output_dir)
+    parent = os.path.dirname(prefix) or "."
+    kept = {live_directory(output_dir), previous_directory(output_dir)}
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if not path.startswith(prefix):
+            continue
+        if os.path.islink(path):
+            os.unlink(path)
+        elif os.path.isdir(path) and os.path.realpath(path) not in kept:
+            shutil.rmtree(path)
+
+# creates an empty build directory for output_dir; when reuse_previous is True it starts as a hardlinked copy
+# of the live output, so an incremental build only writes the files that changed
+def create_staging_directory(output_dir, reuse_previous=True):
+    remove_abandoned_builds(output_dir)
+    staging_dir = f"{build_directory_prefix(output_dir)}{time.time_ns()}"
+    live = live_directory(output_dir)
+    if reuse_previous and (live is not None):
+        link_tree(live, staging_dir)
+    else:
+        os.makedirs(staging_dir)
+    return staging_dir
+
+def remove_staging_directory(staging_dir):
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+# points output_dir at staging_dir, keeps the build it replaces as the previous build and removes older ones
+# a plain output directory from before staged builds is moved aside once, after which every publish is a
+# single rename of a symlink and readers always see either the complete old build or the complete new one
+def publish_directory(staging_dir, output_dir):
+    previous = live_directory(output_dir)
+    link_path = f"{staging_dir}.link"
+    os.symlink(os.path.basename(staging_dir), link_path)
+    if os.path.isdir(output_dir) and not os.path.islink(output_dir):
+        retired_dir = f"{staging_dir}.retired"
+        os.rename(output_dir, retired_dir)
+        previous = retired_dir
+    os.replace(link_path, output_dir)
+    if (previous is not None) and (os.path.realpath(previous) != os.path.realpath(staging_dir)):
+        previous_link = f"{staging_dir}.previous-link"
+        os.symlink(os.path.basename(previous), previous_link)
+        os.replace(previous_link, previous_link_path(output_dir))
+    remove_abandoned_builds(output_dir)
@@ -0,0 +1,41 @@
+import os
+import random
+import tempfile
+import unittest
+from benchcorpus import *
+from markdowntohtml import markdown_to_page
+
+class TestBenchCorpus(unittest.TestCase):
+    def read_corpus(self, directory):
+        pages = {}
+        for parent, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(parent, name)
+                with open(path) as page_file:
+                    pages[os.path.relpath(path, directory)] = page_file.read()
+        return pages
+    def test_deterministic(self):
+        spec = CorpusSpec(pages=20, page_size=1000, seed=7)
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            first_bytes = generate_corpus(first_dir, spec)
+            second_bytes = generate_corpus(second_dir, spec)
+            self.assertEqual(first_bytes, second_bytes)
+            self.assertEqual(self.read_corpus(first_dir), self.read_corpus(second_dir))
+            self.assertEqual(len(self.read_corpus(first_dir)), 20)
+    def test_page_size(self):
+        spec = CorpusSpec(page_size=5000)
+        markdown = generate_page_markdown(random.Random(0), spec, 0)
+        self.assertGreaterEqual(len(markdown), 5000)
+        self.assertLess(len(markdown), 6000)
+    def test_pages_parse(self):
+        spec = CorpusSpec(page_size=3000, list_ratio=0.3, quote_ratio=0.2, code_ratio=0.2, inline_density=0.5)
+        rng = random.Random(spec.seed)
+        for page_number in range(20):
+            page = markdown_to_page(generate_page_markdown(rng, spec, page_number))
+            self.assertTrue(page.title.startswith(f"Page {page_number}:"))
+            page.node.to_html()
+    def test_no_inline_markup(self):
+        spec = CorpusSpec(page_size=2000, list_ratio=0, quote_ratio=0, code_ratio=0, inline_density=0)
+        markdown = generate_page_markdown(random.Random(0), spec, 0)
+        for character in "*`[!":
+            self.assertNotIn(character, markdown)
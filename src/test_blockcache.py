@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import blockcache
+from blockcache import *
+from markdowntohtml import markdown_to_html_node, markdown_to_page
+from htmlnode import FragmentNode
+
+class TestBlockCache(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("A paragraph."))
+        cache.put("A paragraph.", "<p>A paragraph.</p>")
+        self.assertEqual(cache.get("A paragraph."), "<p>A paragraph.</p>")
+        self.assertEqual(cache.stats(), {"hits": 1, "disk_hits": 0, "misses": 1, "evictions": 0, "entries": 1})
+    def test_merge(self):
+        cache = BlockCache()
+        cache.put("A paragraph.", "<p>A paragraph.</p>")
+        cache.get("A paragraph.")
+        cache.merge({"hits": 2, "disk_hits": 1, "misses": 3, "evictions": 0, "entries": 3})
+        self.assertEqual(cache.stats(), {"hits": 3, "disk_hits": 1, "misses": 3, "evictions": 0, "entries": 4})
+        self.assertIn("4 entries", cache.summary())
+    def test_least_recently_used_evicted(self):
+        cache = BlockCache(max_entries=2)
+        cache.put("first", "<p>first</p>")
+        cache.put("second", "<p>second</p>")
+        cache.get("first")
+        cache.put("third", "<p>third</p>")
+        self.assertEqual(cache.get("first"), "<p>first</p>")
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.evictions, 1)
+    def test_disk_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            BlockCache(directory=directory).put("A paragraph.", "<p>A paragraph.</p>")
+            cache = BlockCache(directory=directory)
+            self.assertEqual(cache.get("A paragraph."), "<p>A paragraph.</p>")
+            self.assertEqual(cache.get("A paragraph."), "<p>A paragraph.</p>")
+            self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (1, 1, 0))
+            self.assertTrue(os.path.isfile(cache.fragment_path(BlockCache.key("A paragraph."))))
+    def test_summary(self):
+        cache = BlockCache()
+        cache.put("block", "<p>block</p>")
+        cache.get("block")
+        cache.get("other")
+        self.assertIn("1 hits", cache.summary())
+        self.assertIn("50.0% hit rate", cache.summary())
+
+class TestCachedMarkdown(unittest.TestCase):
+    def test_same_html(self):
+        markdown = "# Title\n\nA **bold** paragraph.\n\n* one\n* two\n\n```\ncode\n```\n\nA **bold** paragraph."
+        cache = BlockCache()
+        first = markdown_to_html_node(markdown, cache)
+        second = markdown_to_html_node(markdown, cache)
+        expected = markdown_to_html_node(markdown).to_html()
+        self.assertEqual(first.to_html(), expected)
+        self.assertEqual(second.to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (5, 3))
+    def test_headings_not_cached(self):
+        cache = BlockCache()
+        page = markdown_to_page("# Title\n\nText.", cache)
+        self.assertEqual(page.title, "Title")
+        self.assertNotIsInstance(page.node.children[0], FragmentNode)
+        self.assertIsInstance(page.node.children[1], FragmentNode)
+        self.assertEqual(cache.stats()["entries"], 1)
+
+class TestBlockCacheSwitch(unittest.TestCase):
+    def test_enable_disable(self):
+        cache = enable_block_cache(16)
+        self.assertIs(blockcache.active_block_cache, cache)
+        self.assertIs(disable_block_cache(), cache)
+        self.assertIsNone(blockcache.active_block_cache)
@@ -0,0 +1,82 @@
+import os
+from buildmanifest import *
+from testsupport import TemporaryDirectoryTestCase
+
+class TestBuildManifest(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = os.path.join(self.root, "public")
+        self.source = os.path.join(self.root, "page.md")
+        self.output = os.path.join(self.output_dir, "page.html")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        os.makedirs(self.output_dir)
+        with open(self.source, "w") as source_file:
+            source_file.write("# Title")
+        with open(self.output, "w") as output_file:
+            output_file.write("<h1>Title</h1>")
+    def test_new_page_not_current(self):
+        manifest = BuildManifest(self.manifest_path)
+        self.assertFalse(manifest.page_is_current(self.source, self.output, self.output_dir, "template"))
+    def test_recorded_page_current(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        self.assertTrue(manifest.page_is_current(self.source, self.output, self.output_dir, "template"))
+    def test_save_load_roundtrip(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        manifest.save()
+        loaded = BuildManifest.load(self.manifest_path)
+        self.assertTrue(loaded.page_is_current(self.source, self.output, self.output_dir, "template"))
+    def test_load_missing(self):
+        manifest = BuildManifest.load(os.path.join(self.root, "missing.json"))
+        self.assertEqual(manifest.pages, {})
+    def test_load_corrupt(self):
+        with open(self.manifest_path, "w") as manifest_file:
+            manifest_file.write("{not json")
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.pages, {})
+    def test_template_changed(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        self.assertFalse(manifest.page_is_current(self.source, self.output, self.output_dir, "other template"))
+    def test_source_changed(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        with open(self.source, "w") as source_file:
+            source_file.write("# A different title")
+        self.assertFalse(manifest.page_is_current(self.source, self.output, self.output_dir, "template"))
+    def test_generator_version_changed(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        manifest.pages[normalize_path(self.source)]["generator_version"] = "0"
+        self.assertFalse(manifest.page_is_current(self.source, self.output, self.output_dir, "template"))
+    def test_output_missing(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        os.remove(self.output)
+        self.assertFalse(manifest.page_is_current(self.source, self.output, self.output_dir, "template"))
+    def test_file_hash_reuses_entry(self):
+        manifest = BuildManifest(self.manifest_path)
+        first_hash = manifest.file_hash(self.source)
+        manifest.files[normalize_path(self.source)]["hash"] = "cached"
+        self.assertNotEqual(first_hash, "cached")
+        self.assertEqual(manifest.file_hash(self.source), "cached")
+    def test_remove_stale_pages(self):
+        nested_output = os.path.join(self.output_dir, "nested", "page.html")
+        os.makedirs(os.path.dirname(nested_output))
+        with open(nested_output, "w") as output_file:
+            output_file.write("<p>stale</p>")
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, nested_output, self.output_dir, "template")
+        manifest.save()
+        manifest = BuildManifest.load(self.manifest_path)
+        removed = manifest.remove_stale_pages(self.output_dir)
+        self.assertEqual(removed, [normalize_path(self.source)])
+        self.assertFalse(os.path.exists(os.path.dirname(nested_output)))
+        self.assertTrue(os.path.exists(self.output))
+        self.assertEqual(manifest.pages, {})
+    def test_seen_pages_kept(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_page(self.source, self.output, self.output_dir, "template")
+        self.assertEqual(manifest.remove_stale_pages(self.output_dir), [])
+        self.assertTrue(os.path.exists(self.output))
@@ -0,0 +1,82 @@
+import os
+from unittest import mock
+from filesync import *
+from testsupport import TemporaryDirectoryTestCase
+
+class FileSyncTestCase(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.root, "static")
+        self.destination = os.path.join(self.root, "public")
+        self.write_file(os.path.join(self.source, "index.css"), "body { color: black; }")
+        self.write_file(os.path.join(self.source, "images", "logo.png"), "PNG" * 1000)
+
+class TestCopyFile(FileSyncTestCase):
+    def test_copy_contents_and_mtime(self):
+        source_path = os.path.join(self.source, "images", "logo.png")
+        destination_path = os.path.join(self.root, "logo.png")
+        copy_file(source_path, destination_path)
+        self.assertEqual(self.read_file(destination_path), "PNG" * 1000)
+        self.assertTrue(file_is_current(os.stat(source_path), destination_path))
+    def test_copy_replaces_hardlinked_destination(self):
+        source_path = os.path.join(self.source, "index.css")
+        destination_path = os.path.join(self.root, "index.css")
+        other_path = os.path.join(self.root, "other.css")
+        self.write_file(other_path, "old")
+        os.link(other_path, destination_path)
+        copy_file(source_path, destination_path)
+        self.assertEqual(self.read_file(destination_path), "body { color: black; }")
+        self.assertEqual(self.read_file(other_path), "old")
+    def test_link(self):
+        source_path = os.path.join(self.source, "index.css")
+        destination_path = os.path.join(self.root, "index.css")
+        copy_file(source_path, destination_path, link=True)
+        self.assertTrue(os.path.samefile(source_path, destination_path))
+    def test_empty_file(self):
+        source_path = os.path.join(self.root, "empty.txt")
+        destination_path = os.path.join(self.root, "empty_copy.txt")
+        self.write_file(source_path, "")
+        copy_file(source_path, destination_path)
+        self.assertEqual(self.read_file(destination_path), "")
+
+    def test_fallback_when_nothing_copied(self):
+        source_path = os.path.join(self.source, "images", "logo.png")
+        destination_path = os.path.join(self.root, "logo.png")
+        with mock.patch.object(os, "copy_file_range", return_value=0, create=True):
+            with mock.patch.object(os, "sendfile", return_value=0, create=True):
+                copy_file(source_path, destination_path)
+        self.assertEqual(self.read_file(destination_path), "PNG" * 1000)
+
+class TestSyncDirectory(FileSyncTestCase):
+    def test_initial_sync(self):
+        synced_files, copied_count = sync_directory(self.source, self.destination)
+        self.assertEqual(synced_files, {"index.css", os.path.join("images", "logo.png")})
+        self.assertEqual(copied_count, 2)
+        self.assertEqual(self.read_file(os.path.join(self.destination, "index.css")), "body { color: black; }")
+    def test_unchanged_files_skipped(self):
+        sync_directory(self.source, self.destination)
+        synced_files, copied_count = sync_directory(self.source, self.destination)
+        self.assertEqual(len(synced_files), 2)
+        self.assertEqual(copied_count, 0)
+    def test_changed_file_copied(self):
+        sync_directory(self.source, self.destination)
+        self.write_file(os.path.join(self.source, "index.css"), "body { color: white; background: black; }")
+        synced_files, copied_count = sync_directory(self.source, self.destination)
+        self.assertEqual(copied_count, 1)
+        self.assertEqual(self.read_file(os.path.join(self.destination, "index.css")), "body { color: white; background: black; }")
+
+class TestRemoveStaleFiles(FileSyncTestCase):
+    def test_remove_stale(self):
+        previous_files, _ = sync_directory(self.source, self.destination)
+        os.remove(os.path.join(self.source, "images", "logo.png"))
+        current_files, _ = sync_directory(self.source, self.destination)
+        removed = remove_stale_files(self.destination, previous_files, current_files)
+        self.assertEqual(removed, [os.path.join("images", "logo.png")])
+        self.assertFalse(os.path.exists(os.path.join(self.destination, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.destination, "index.css")))
+    def test_unlisted_files_kept(self):
+        sync_directory(self.source, self.destination)
+        self.write_file(os.path.join(self.destination, "index.html"), "<p>page</p>")
+        removed = remove_stale_files(self.destination, ["index.css"], ["index.css"])
+        self.assertEqual(removed, [])
+        self.assertTrue(os.path.exists(os.path.join(self.destination, "index.html")))
@@ -0,0 +1,114 @@
+import sys
+import unittest
+from io import StringIO
+from htmlnode import *
+from markdowntohtml import markdown_to_page
+from blockcache import BlockCache
+from flattree import *
+
+MARKDOWN = """# The Title
+
+A paragraph with **bold**, *italic*, `code`, a [link](/url) and an ![image](/image.png).
+
+> a quote
+> over two lines
+
+* first
+* second
+
+1. one
+2. two
+
+```
+code block
+```
+"""
+
+class TestFlatDocument(unittest.TestCase):
+    def test_from_node_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode(None, "text "), LeafNode("a", "link", {"href": "/url"})]),
+            LeafNode("img", "", {"src": "/image.png", "alt": "image"}),
+            FragmentNode("<hr>"),
+            ParentNode("ul", []),
+        ])
+        document = FlatDocument.from_node(node)
+        self.assertEqual(document.to_html(), node.to_html())
+        self.assertEqual(len(document), 7)
+    def test_to_node(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode(None, "text "), LeafNode("b", "bold")]),
+            FragmentNode("<hr>"),
+        ], {"class": "page"})
+        document = FlatDocument.from_node(node)
+        self.assertEqual(document.to_node(), node)
+        self.assertEqual(document.to_node(1), node.children[0])
+        self.assertEqual(document.to_node(3), LeafNode("b", "bold"))
+    def test_accessors(self):
+        node = ParentNode("p", [LeafNode(None, "text "), LeafNode("a", "link", {"href": "/url"})])
+        document = FlatDocument.from_node(node)
+        self.assertEqual(list(document.children(0)), [1, 2])
+        self.assertEqual(list(document.children(1)), [])
+        self.assertEqual(document.tag(0), "p")
+        self.assertIsNone(document.tag(1))
+        self.assertEqual(document.value(1), "text ")
+        self.assertEqual(document.value(2), "link")
+        self.assertEqual(document.node_props(2), {"href": "/url"})
+        self.assertIsNone(document.node_props(0))
+    def test_chunked_html(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode("b", f"item {number}")]) for number in range(CHUNK_NODES)])
+        document = FlatDocument.from_node(node)
+        self.assertGreater(len(list(document.iter_html())), 1)
+        output = StringIO()
+        document.write_html(output)
+        self.assertEqual(output.getvalue(), node.to_html())
+    def test_deep_tree(self):
+        node = LeafNode("b", "deep")
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = ParentNode("span", [node])
+        document = FlatDocument.from_node(node)
+        self.assertEqual(document.to_html(), node.to_html())
+    def test_invalid_nodes(self):
+        with self.assertRaises(ValueError):
+            FlatDocument.from_node(ParentNode("div", [LeafNode("b", None)]))
+        with self.assertRaises(ValueError):
+            FlatDocument.from_node(ParentNode(None, [LeafNode("b", "bold")]))
+        with self.assertRaises(ValueError):
+            FlatDocument.from_node(ParentNode("div", None))
+    def test_escaping(self):
+        node = ParentNode("p", [
+            LeafNode(None, "1 < 2 & "),
+            LeafNode("a", "<link>", {"href": '/url?a="b"'}),
+            FragmentNode("<hr>"),
+        ], {"title": "a & b"})
+        document = FlatDocument.from_node(node)
+        self.assertEqual(document.to_html(), node.to_html())
+        self.assertEqual(document.value(1), "1 < 2 & ")
+    def test_non_string_values(self):
+        node = ParentNode("tr", [LeafNode("td", 42), LeafNode(None, 1.5)])
+        self.assertEqual(FlatDocument.from_node(node).to_html(), "<tr><td>42</td>1.5</tr>")
+    def test_untagged_leaf_with_props(self):
+        node = LeafNode(None, "text", {"class": "ignored"})
+        self.assertEqual(FlatDocument.from_node(node).to_html(), "text")
+        node = ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text", {"class": "ignored"})])
+        self.assertEqual(FlatDocument.from_node(node).to_html(), node.to_html())
+    def test_unclosed_parent(self):
+        builder = FlatDocumentBuilder()
+        builder.start_parent("div")
+        builder.add_leaf("p", "text")
+        with self.assertRaises(ValueError):
+            builder.build()
+
+class TestMarkdownToFlatPage(unittest.TestCase):
+    def test_matches_node_page(self):
+        page = markdown_to_page(MARKDOWN)
+        flat_page = markdown_to_flat_page(MARKDOWN)
+        self.assertEqual(flat_page.node.to_html(), page.node.to_html())
+        self.assertEqual(flat_page.node.to_node(), page.node)
+        self.assertEqual(flat_page.title, "The Title")
+    def test_cached_blocks(self):
+        cache = BlockCache()
+        html = markdown_to_page(MARKDOWN).node.to_html()
+        self.assertEqual(markdown_to_flat_page(MARKDOWN, cache).node.to_html(), html)
+        self.assertEqual(markdown_to_flat_page(MARKDOWN, cache).node.to_html(), html)
+        self.assertGreater(cache.hits, 0)
@@ -1,4 +1,6 @@
+import sys
 import unittest
+from io import StringIO
 from textnode import *
 from htmlnode import *
 
@@ -327,6 +329,70 @@ class TestParentNode(unittest.TestCase):
         expected = '<html><body><h1 style="color:blue;">Blue Heading</h1><p style="color:gray;">First sentence of gray paragraph. Second sentence with<b> bold text</b> and<i> italic text</i> in it.</p><p style="color:black;">First sentence of black paragraph. Second sentence with<a href="https://www.google.com" target="_blank"> a hyperlink</a> in it.</p></body></html>'
         self.assertEqual(html, expected)
 
+class TestIterHTML(unittest.TestCase):
+    def complex_node(self):
+        return ParentNode("div", [
+            LeafNode("h1", "Heading", {"style": "color:blue;"}),
+            ParentNode("p", [
+                LeafNode(None, "Text with"),
+                LeafNode("b", " bold text"),
+                LeafNode("a", " a link", {"href": "https://www.google.com"})
+            ]),
+            ParentNode("ul", [
+                LeafNode("li", "First item"),
+                ParentNode("li", [LeafNode("i", "Second item")])
+            ])
+        ])
+    def test_leaf(self):
+        node = LeafNode("p", "A paragraph.")
+        self.assertEqual(list(node.iter_html()), ["<p>A paragraph.</p>"])
+    def test_matches_to_html(self):
+        node = self.complex_node()
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+    def test_chunks(self):
+        node = ParentNode("p", [LeafNode(None, "Text"), LeafNode("b", "bold")])
+        self.assertEqual(list(node.iter_html()), ["<p>", "Text", "<b>bold</b>", "</p>"])
+    def test_write_html(self):
+        node = self.complex_node()
+        output = StringIO()
+        node.write_html(output)
+        self.assertEqual(output.getvalue(), node.to_html())
+    def test_no_tag(self):
+        node = ParentNode(None, [LeafNode(None, "Text")])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+    def test_no_child(self):
+        node = ParentNode("p", None)
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+    def test_nested_no_value(self):
+        node = ParentNode("p", [LeafNode(None, "Text"), LeafNode("b", None)])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+
+class TestSerializerDepth(unittest.TestCase):
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        node = LeafNode("p", "leaf")
+        for level in range(depth):
+            node = ParentNode("div", [node], {"class": "nested"})
+        expected = '<div class="nested">' * depth + "<p>leaf</p>" + "</div>" * depth
+        self.assertEqual(node.to_html(), expected)
+        self.assertEqual("".join(node.iter_html()), expected)
+    def test_wide(self):
+        items = [LeafNode("li", f"item {number}") for number in range(10000)]
+        node = ParentNode("ul", items + [ParentNode("li", [LeafNode("b", "last")])])
+        expected = "<ul>" + "".join(f"<li>item {number}</li>" for number in range(10000)) + "<li><b>last</b></li></ul>"
+        self.assertEqual(node.to_html(), expected)
+    def test_empty_children(self):
+        node = ParentNode("div", [ParentNode("span", []), LeafNode(None, "text")])
+        self.assertEqual(node.to_html(), "<div><span></span>text</div>")
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+    def test_nested_no_tag(self):
+        node = ParentNode("div", [LeafNode(None, "text"), ParentNode(None, [LeafNode(None, "text")])])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
 class TestTextToHTML(unittest.TestCase):
     def test_text_type(self):
         text_node = TextNode("A string of text.", TextType.TEXT,)
@@ -406,4 +472,67 @@ class TestTextToHTML(unittest.TestCase):
     def test_invalid_type(self):
         text_node = TextNode("A string of text.", "GARBAGE", "https://www.google.com")
         with self.assertRaises(ValueError, msg="Invalid text type."):
-            text_node_to_html_node(text_node)
\ No newline at end of file
+            text_node_to_html_node(text_node)
+
+class TestFragmentNode(unittest.TestCase):
+    def test_fragment_unchanged(self):
+        node = ParentNode("div", [FragmentNode("<p>cached <b>html</b></p>"), LeafNode("p", "text")])
+        self.assertEqual(node.to_html(), "<div><p>cached <b>html</b></p><p>text</p></div>")
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+
+class TestEscaping(unittest.TestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text('a < b && c > "d"'), 'a &lt; b &amp;&amp; c &gt; "d"')
+        text = "nothing to escape"
+        self.assertIs(escape_text(text), text)
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('/search?q="a"&b=<c>'), "/search?q=&quot;a&quot;&amp;b=&lt;c&gt;")
+    def test_leaf_value(self):
+        self.assertEqual(LeafNode("code", "if a < b && c:").to_html(), "<code>if a &lt; b &amp;&amp; c:</code>")
+        self.assertEqual(LeafNode(None, "1 < 2").to_html(), "1 &lt; 2")
+    def test_non_string_values(self):
+        self.assertEqual(LeafNode("td", 42).to_html(), "<td>42</td>")
+        self.assertEqual(LeafNode(None, 1.5).to_html(), "1.5")
+        self.assertEqual(LeafNode("td", 7, {"colspan": 2}).to_html(), '<td colspan="2">7</td>')
+        self.assertEqual(escape_text(3), "3")
+        self.assertEqual(escape_attribute(["<a>"]), "['&lt;a&gt;']")
+    def test_props(self):
+        node = LeafNode("a", "link", {"href": '/url" onclick="alert(1)'})
+        self.assertEqual(node.to_html(), '<a href="/url&quot; onclick=&quot;alert(1)">link</a>')
+    def test_parent_and_fragment(self):
+        node = ParentNode("p", [LeafNode(None, "<b>"), FragmentNode("<b>raw</b>")], {"title": "a & b"})
+        self.assertEqual(node.to_html(), '<p title="a &amp; b">&lt;b&gt;<b>raw</b></p>')
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+
+class TestTagTables(unittest.TestCase):
+    def test_common_tags_prebuilt(self):
+        self.assertEqual(OPEN_TAGS["li"], "<li>")
+        self.assertEqual(CLOSE_TAGS["li"], "</li>")
+    def test_new_tag_added(self):
+        self.assertNotIn("section", OPEN_TAGS)
+        node = ParentNode("section", [LeafNode("mark", "text")])
+        self.assertEqual(node.to_html(), "<section><mark>text</mark></section>")
+        self.assertEqual(OPEN_TAGS["section"], "<section>")
+        self.assertEqual(CLOSE_TAGS["mark"], "</mark>")
+
+class TestPropsMemo(unittest.TestCase):
+    def test_identical_props_shared(self):
+        first = LeafNode("a", "one", {"href": "/memo-page"}).props_to_html()
+        second = LeafNode("a", "two", {"href": "/memo-page"}).props_to_html()
+        self.assertEqual(first, ' href="/memo-page"')
+        self.assertIs(first, second)
+    def test_order_kept(self):
+        node = LeafNode("img", "", {"src": "/image.png", "alt": "image"})
+        self.assertEqual(node.to_html(), '<img src="/image.png" alt="image"></img>')
+    def test_equal_values_of_other_types(self):
+        self.assertEqual(LeafNode("input", "", {"hidden": 1}).props_to_html(), ' hidden="1"')
+        self.assertEqual(LeafNode("input", "", {"hidden": True}).props_to_html(), ' hidden="True"')
+        self.assertEqual(LeafNode("input", "", {"hidden": 1.0}).props_to_html(), ' hidden="1.0"')
+    def test_unhashable_and_non_string_values(self):
+        self.assertEqual(HTMLNode("td", "cell", None, {"colspan": 2}).props_to_html(), ' colspan="2"')
+        self.assertEqual(HTMLNode("div", "", None, {"class": ["a", "b"]}).props_to_html(), " class=\"['a', 'b']\"")
+
+class TestSlots(unittest.TestCase):
+    def test_no_instance_dict(self):
+        for node in (HTMLNode("p", "text"), LeafNode("b", "bold"), ParentNode("div", [LeafNode("b", "bold")]), FragmentNode("<p>text</p>")):
+            self.assertFalse(hasattr(node, "__dict__"))
@@ -0,0 +1,127 @@
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+from main import *
+from watch import ChangeSet
+from testsupport import TemporaryDirectoryTestCase
+
+class SiteTestCase(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content_dir = os.path.join(self.root, "content")
+        self.template_path = os.path.join(self.root, "template.html")
+        self.write_file(self.template_path, "<title>{{ Title }}</title><article>{{ Content }}</article>")
+        self.write_file(os.path.join(self.content_dir, "index.md"), "# Home\n\nA **bold** start.")
+        self.write_file(os.path.join(self.content_dir, "posts", "first.md"), "# First\n\n* one\n* two")
+        self.write_file(os.path.join(self.content_dir, "posts", "second.md"), "# Second\n\n> quoted")
+        self.write_file(os.path.join(self.content_dir, "posts", "notes.txt"), "not markdown")
+    def read_tree(self, directory):
+        files = {}
+        for parent, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(parent, name)
+                with open(path, "rb") as read_file:
+                    files[os.path.relpath(path, directory)] = read_file.read()
+        return files
+
+class TestCollectPages(SiteTestCase):
+    def test_collects_markdown_only(self):
+        pages = collect_pages(self.content_dir, os.path.join(self.root, "public"))
+        destinations = sorted(os.path.relpath(dest, self.root) for _, dest in pages)
+        expected = [
+            os.path.join("public", "index.html"),
+            os.path.join("public", "posts", "first.html"),
+            os.path.join("public", "posts", "second.html"),
+        ]
+        self.assertEqual(destinations, expected)
+
+class TestGeneratePages(SiteTestCase):
+    def test_parallel_matches_serial(self):
+        serial_dir = os.path.join(self.root, "serial")
+        parallel_dir = os.path.join(self.root, "parallel")
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content_dir, self.template_path, serial_dir)
+            generate_pages_recursive(self.content_dir, self.template_path, parallel_dir, jobs=3)
+        self.assertEqual(self.read_tree(serial_dir), self.read_tree(parallel_dir))
+        self.assertEqual(len(self.read_tree(serial_dir)), 3)
+    def test_failures_reported(self):
+        self.write_file(os.path.join(self.content_dir, "posts", "broken.md"), "No title here.")
+        output_dir = os.path.join(self.root, "public")
+        for jobs in (1, 2):
+            with redirect_stdout(StringIO()):
+                with self.assertRaises(PageGenerationError) as context:
+                    generate_pages_recursive(self.content_dir, self.template_path, output_dir, jobs=jobs)
+            failures = context.exception.failures
+            self.assertEqual(len(failures), 1)
+            self.assertTrue(str(failures[0][0]).endswith("broken.md"))
+            self.assertIn("No title heading.", str(context.exception))
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "posts", "first.html")))
+    def test_manifest_skips_unchanged(self):
+        output_dir = os.path.join(self.root, "public")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        with redirect_stdout(StringIO()) as first_output:
+            generate_pages_recursive(self.content_dir, self.template_path, output_dir, manifest)
+        self.assertEqual(first_output.getvalue().count("Generating page"), 3)
+        self.write_file(os.path.join(self.content_dir, "posts", "second.md"), "# Second\n\n> edited quote")
+        manifest.seen_pages = set()
+        with redirect_stdout(StringIO()) as second_output:
+            generate_pages_recursive(self.content_dir, self.template_path, output_dir, manifest)
+        self.assertEqual(second_output.getvalue().count("Generating page"), 1)
+        self.assertIn("second.md", second_output.getvalue())
+    def test_block_cache_matches_uncached(self):
+        uncached_dir = os.path.join(self.root, "uncached")
+        cached_dir = os.path.join(self.root, "cached")
+        cache = enable_block_cache(directory=os.path.join(self.root, "cache"))
+        try:
+            with redirect_stdout(StringIO()):
+                generate_pages_recursive(self.content_dir, self.template_path, cached_dir, jobs=2)
+                generate_pages_recursive(self.content_dir, self.template_path, cached_dir)
+        finally:
+            blockcache.disable_block_cache()
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content_dir, self.template_path, uncached_dir)
+        self.assertEqual(self.read_tree(cached_dir), self.read_tree(uncached_dir))
+        self.assertEqual(cache.stats()["disk_hits"], 3)
+        self.assertEqual(cache.stats()["misses"], 3)
+    def test_incremental_pages(self):
+        output_dir = os.path.join(self.root, "public")
+        incremental_pages = {}
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content_dir, self.template_path, output_dir, jobs=2, incremental_pages=incremental_pages)
+            self.write_file(os.path.join(self.content_dir, "posts", "first.md"), "# First\n\n* one\n* two\n\nA new paragraph.")
+            generate_pages_recursive(self.content_dir, self.template_path, output_dir, incremental_pages=incremental_pages)
+        first_page = incremental_pages[os.path.join(self.content_dir, "posts", "first.md")]
+        self.assertEqual((first_page.reparsed, first_page.reused), (1, 2))
+        with open(os.path.join(output_dir, "posts", "first.html")) as output_file:
+            self.assertIn("<p>A new paragraph.</p>", output_file.read())
+    def test_title_and_content_escaped(self):
+        self.write_file(os.path.join(self.content_dir, "index.md"), "# Tom & Jerry\n\nIf a < b, write `a < b`.")
+        output_dir = os.path.join(self.root, "public")
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content_dir, self.template_path, output_dir)
+        with open(os.path.join(output_dir, "index.html")) as output_file:
+            self.assertEqual(
+                output_file.read(),
+                "<title>Tom &amp; Jerry</title><article><div><h1>Tom &amp; Jerry</h1><p>If a &lt; b, write <code>a &lt; b</code>.</p></div></article>",
+            )
+
+class TestRebuildChanges(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.previous_dir = os.getcwd()
+        os.chdir(self.root)
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        super().tearDown()
+    def test_parse_state_kept_for_content_changes_only(self):
+        manifest = BuildManifest(MANIFEST_PATH)
+        incremental_pages = {}
+        with redirect_stdout(StringIO()):
+            self.assertTrue(rebuild_changes(ChangeSet(template_changed=True), manifest, incremental_pages=incremental_pages))
+            self.assertEqual(incremental_pages, {})
+            source = os.path.join(CONTENT_DIR, "posts", "first.md")
+            self.write_file(source, "# First\n\n* one\n* two\n* three")
+            self.assertTrue(rebuild_changes(ChangeSet(content_changed=[source]), manifest, incremental_pages=incremental_pages))
+        self.assertEqual(list(incremental_pages), [normalize_path(source)])
+        with open(os.path.join(OUTPUT_DIR, "posts", "first.html")) as output_file:
+            self.assertIn("<li>three</li>", output_file.read())
@@ -1,4 +1,5 @@
 import unittest
+from io import StringIO
 from markdownparsing import *
 
 class TestIsHeadingBlock(unittest.TestCase):
@@ -265,6 +266,25 @@ class TestExtractMarkdownLikes(unittest.TestCase):
         expected = []
         self.assertEqual(extracted, expected)
 
+class TestExtractMarkdownSpans(unittest.TestCase):
+    def test_source_order(self):
+        text = "A [link](/a) then ![image](/b.png) and [another](/c)."
+        expected = [
+            (SpanType.LINK, "link", "/a", 2, 12),
+            (SpanType.IMAGE, "image", "/b.png", 18, 34),
+            (SpanType.LINK, "another", "/c", 39, 52),
+        ]
+        self.assertEqual(extract_markdown_spans(text), expected)
+    def test_no_spans(self):
+        self.assertEqual(extract_markdown_spans("Plain [brackets] and (parentheses)."), [])
+    def test_image_not_link(self):
+        self.assertEqual(extract_markdown_spans("![alt](/a.png)"), [(SpanType.IMAGE, "alt", "/a.png", 0, 14)])
+    def test_image_inside_link_url(self):
+        self.assertEqual(extract_markdown_spans("[a](![b)](c)"), [(SpanType.IMAGE, "b)", "c", 4, 12)])
+    def test_range(self):
+        text = "[a](b) [c](d)"
+        self.assertEqual(list(iter_markdown_spans(text, 1, len(text))), [(SpanType.LINK, "c", "d", 7, 13)])
+
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_single_block_single_line(self):
         markdown = '''# This is a single line of header text'''
@@ -422,4 +442,61 @@ class TestBlockToBlockType(unittest.TestCase):
         block = "1. First ordered item\n2. Second ordered item\n3. Third ordered item"
         block_type = block_to_block_type(block)
         expected = BlockType.ORDERED
-        self.assertEqual(block_type, expected)
\ No newline at end of file
+        self.assertEqual(block_type, expected)
+    def test_ordered_block_with_blank_line(self):
+        block = "1. First ordered item\n\n2. Second ordered item"
+        block_type = block_to_block_type(block)
+        expected = BlockType.PARAGRAPH
+        self.assertEqual(block_type, expected)
+    def test_code_block_trailing_newline(self):
+        block = "```\ncode\n```\n"
+        block_type = block_to_block_type(block)
+        expected = BlockType.CODE
+        self.assertEqual(block_type, expected)
+    def test_empty_block(self):
+        block_type = block_to_block_type("")
+        expected = BlockType.PARAGRAPH
+        self.assertEqual(block_type, expected)
+
+class TestClassifyBlock(unittest.TestCase):
+    def test_list_lines_returned(self):
+        block = "* First unordered item\n* Second unordered item"
+        self.assertEqual(classify_block(block), (BlockType.UNORDERED, ["* First unordered item", "* Second unordered item"]))
+    def test_quote_lines_returned(self):
+        block = ">First line\n>Second line"
+        self.assertEqual(classify_block(block), (BlockType.QUOTE, [">First line", ">Second line"]))
+    def test_paragraph_no_lines(self):
+        self.assertEqual(classify_block("- not\na list"), (BlockType.PARAGRAPH, None))
+    def test_heading_no_lines(self):
+        self.assertEqual(classify_block("## Heading"), (BlockType.HEADING, None))
+    def test_ordered_out_of_sequence(self):
+        self.assertEqual(classify_block("1. First\n3. Third"), (BlockType.PARAGRAPH, None))
+
+class TestIterMarkdownBlocks(unittest.TestCase):
+    def test_lazy(self):
+        def lines():
+            yield "First block\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+        blocks = iter_markdown_blocks(lines())
+        self.assertEqual(next(blocks), "First block")
+    def test_lines_match_string(self):
+        markdown = "\n\nFirst block\nsecond line\n\n\n\n  Second block  \n\n\n\n\n* item\n\n \n\n"
+        lines = StringIO(markdown, newline="\n")
+        self.assertEqual(list(iter_markdown_blocks(lines)), markdown_to_blocks(markdown))
+
+class TestBlockSpans(unittest.TestCase):
+    def test_spans_index_source(self):
+        markdown = "  # Heading \n\n\n* item\n\n"
+        spans = list(iter_block_spans(markdown))
+        self.assertEqual(spans, [(markdown, 2, 11), (markdown, 15, 21)])
+    def test_strip_span(self):
+        self.assertEqual(strip_span(" \t ab c\n ", 0, 9), (3, 7))
+        self.assertEqual(strip_span("   ", 0, 3), (3, 3))
+    def test_split_line_spans(self):
+        self.assertEqual(split_line_spans("xa\nb\n", 1, 5), [(1, 2), (3, 4), (5, 5)])
+    def test_classify_span(self):
+        text = "para\n\n1. one\n2. two"
+        self.assertEqual(classify_span(text, 6, len(text)), (BlockType.ORDERED, [(6, 12), (13, 19)]))
+        self.assertEqual(classify_span(text, 0, 4), (BlockType.PARAGRAPH, None))
+        self.assertEqual(classify_span(text, 6, 6), (BlockType.PARAGRAPH, None))
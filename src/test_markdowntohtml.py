@@ -1,4 +1,5 @@
 import unittest
+from io import StringIO
 from markdowntohtml import *
 
 class TestTextToInlineNodes(unittest.TestCase):
@@ -575,4 +576,63 @@ class TestExtractTitle(unittest.TestCase):
     def test_multiple_title_with_other_headings(self):
         markdown = "#First title heading\n\nFirst line of first paragraph.\nSecond line of first paragraph.\n\n#Second title heading\n\nFirst line of second paragraph.\nSecond line of second paragraph."
         with self.assertRaises(Exception, msg="Multiple title headings."):
-            title = extract_title(markdown)
\ No newline at end of file
+            title = extract_title(markdown)
+class TestMarkdownToPage(unittest.TestCase):
+    def test_node_matches_markdown_to_html_node(self):
+        markdown = "#Title heading\n\n##Second heading\n\nA paragraph with **bold text**.\n\n* First item\n* Second item"
+        page = markdown_to_page(markdown)
+        self.assertEqual(page.node, markdown_to_html_node(markdown))
+    def test_title(self):
+        markdown = "#Title heading\n\n##Second heading\n\nFirst line of paragraph."
+        page = markdown_to_page(markdown)
+        self.assertEqual(page.title, extract_title(markdown))
+    def test_headings(self):
+        markdown = "#Title heading\n\nFirst line of paragraph.\n\n##Second heading\n\n###Third heading"
+        page = markdown_to_page(markdown)
+        expected = [
+            LeafNode("h1", "Title heading"),
+            LeafNode("h2", "Second heading"),
+            LeafNode("h3", "Third heading")
+        ]
+        self.assertEqual(page.headings, expected)
+    def test_no_title_heading(self):
+        markdown = "##Second heading\n\nFirst line of paragraph."
+        page = markdown_to_page(markdown)
+        with self.assertRaises(Exception, msg="No title heading."):
+            title = page.title
+    def test_multiple_title_headings(self):
+        markdown = "#First title heading\n\n#Second title heading"
+        page = markdown_to_page(markdown)
+        with self.assertRaises(Exception, msg="Multiple title headings."):
+            title = page.title
+    def test_lines(self):
+        markdown = "#Title heading\n\nFirst line of paragraph.\nSecond line of paragraph.\n\n\n* First item\n* Second item\n"
+        page = markdown_to_page(StringIO(markdown, newline="\n"))
+        self.assertEqual(page.node, markdown_to_html_node(markdown))
+        self.assertEqual(page.title, "Title heading")
+
+class TestIncrementalPage(unittest.TestCase):
+    def setUp(self):
+        self.markdown = "# Title\n\nFirst paragraph.\n\n* one\n* two\n\n## Section\n\nLast paragraph."
+    def test_first_parse_matches(self):
+        incremental_page = IncrementalPage()
+        page = incremental_page.parse(self.markdown)
+        expected = markdown_to_page(self.markdown)
+        self.assertEqual(page.node, expected.node)
+        self.assertEqual(page.headings, expected.headings)
+        self.assertEqual((incremental_page.reparsed, incremental_page.reused), (5, 0))
+    def test_edit_reparses_changed_block(self):
+        incremental_page = IncrementalPage()
+        first = incremental_page.parse(self.markdown)
+        edited = self.markdown.replace("First paragraph.", "Edited **paragraph**.\n\nAdded paragraph.")
+        second = incremental_page.parse(edited)
+        self.assertEqual(second.node, markdown_to_html_node(edited))
+        self.assertEqual((incremental_page.reparsed, incremental_page.reused), (2, 4))
+        self.assertIs(second.node.children[3], first.node.children[2])
+        self.assertEqual(second.title, "Title")
+    def test_removed_blocks_forgotten(self):
+        incremental_page = IncrementalPage()
+        incremental_page.parse(self.markdown)
+        incremental_page.parse("# Title")
+        incremental_page.parse(self.markdown)
+        self.assertEqual((incremental_page.reparsed, incremental_page.reused), (4, 1))
@@ -0,0 +1,73 @@
+import os
+import unittest
+from io import StringIO
+from pagetemplate import *
+from testsupport import TemporaryDirectoryTestCase
+
+class TestCompiledTemplate(unittest.TestCase):
+    def test_compile_segments(self):
+        template = CompiledTemplate.compile("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        expected = ["<title>", "Title", "</title><body>", "Content", "</body>"]
+        self.assertEqual(template.segments, expected)
+    def test_compile_no_placeholders(self):
+        template = CompiledTemplate.compile("<p>static</p>")
+        self.assertEqual(template.segments, ["<p>static</p>"])
+    def test_compile_adjacent_placeholders(self):
+        template = CompiledTemplate.compile("{{ Title }}{{ Content }}")
+        self.assertEqual(template.segments, ["", "Title", "", "Content", ""])
+    def test_render(self):
+        template = CompiledTemplate.compile("<title> {{ Title }} </title>\n<article>{{ Content }}</article>")
+        page = template.render({"Title": "Home", "Content": "<p>Hello</p>"})
+        self.assertEqual(page, "<title> Home </title>\n<article><p>Hello</p></article>")
+    def test_render_repeated_placeholder(self):
+        template = CompiledTemplate.compile("{{ Title }} - {{ Title }}")
+        self.assertEqual(template.render({"Title": "Home"}), "Home - Home")
+    def test_render_missing_value(self):
+        template = CompiledTemplate.compile("<h1>{{ Title }}</h1>{{ Footer }}")
+        self.assertEqual(template.render({"Title": "Home"}), "<h1>Home</h1>{{ Footer }}")
+    def test_render_values_not_substituted(self):
+        template = CompiledTemplate.compile("{{ Content }}|{{ Title }}")
+        page = template.render({"Content": "{{ Title }}", "Title": "Home"})
+        self.assertEqual(page, "{{ Title }}|Home")
+
+class TestTemplateWrite(unittest.TestCase):
+    def test_write_strings(self):
+        template = CompiledTemplate.compile("<title>{{ Title }}</title><article>{{ Content }}</article>")
+        values = {"Title": "Home", "Content": "<p>Hello</p>"}
+        output = StringIO()
+        template.write(output, values)
+        self.assertEqual(output.getvalue(), template.render(values))
+    def test_write_chunks(self):
+        template = CompiledTemplate.compile("<title>{{ Title }}</title><article>{{ Content }}</article>")
+        output = StringIO()
+        template.write(output, {"Title": "Home", "Content": iter(["<p>", "Hello", "</p>"])})
+        self.assertEqual(output.getvalue(), "<title>Home</title><article><p>Hello</p></article>")
+    def test_write_large(self):
+        template = CompiledTemplate.compile("<article>{{ Content }}</article>")
+        chunks = ["<p>paragraph</p>"] * 20000
+        output = StringIO()
+        template.write(output, {"Content": iter(chunks)})
+        self.assertEqual(output.getvalue(), "<article>" + "".join(chunks) + "</article>")
+    def test_write_missing_value(self):
+        template = CompiledTemplate.compile("<h1>{{ Title }}</h1>{{ Footer }}")
+        output = StringIO()
+        template.write(output, {"Title": "Home"})
+        self.assertEqual(output.getvalue(), "<h1>Home</h1>{{ Footer }}")
+
+class TestLoadTemplate(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.template_path = os.path.join(self.root, "template.html")
+        with open(self.template_path, "w") as template_file:
+            template_file.write("<h1>{{ Title }}</h1>")
+    def test_cached(self):
+        first = load_template(self.template_path)
+        second = load_template(self.template_path)
+        self.assertIs(first, second)
+    def test_reloaded_on_change(self):
+        first = load_template(self.template_path)
+        with open(self.template_path, "w") as template_file:
+            template_file.write("<h2>{{ Title }}</h2>")
+        second = load_template(self.template_path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.render({"Title": "Home"}), "<h2>Home</h2>")
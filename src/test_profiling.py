@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import profiling
+from profiling import *
+from markdowntohtml import markdown_to_page
+
+class TestBuildProfiler(unittest.TestCase):
+    def test_stage_recorded(self):
+        profiler = BuildProfiler()
+        with profiler.stage("read"):
+            pass
+        self.assertEqual(profiler.stage_calls, {"read": 1})
+        self.assertGreaterEqual(profiler.stage_times["read"], 0.0)
+    def test_nested_stage_exclusive(self):
+        profiler = BuildProfiler()
+        with profiler.stage("parse"):
+            with profiler.stage("text_to_text_nodes"):
+                time.sleep(0.01)
+        self.assertGreaterEqual(profiler.stage_times["text_to_text_nodes"], 0.01)
+        self.assertLess(profiler.stage_times["parse"], 0.01)
+    def test_page_times(self):
+        profiler = BuildProfiler()
+        with profiler.page("content/index.md"):
+            with profiler.stage("read"):
+                pass
+        with profiler.stage("static_copy"):
+            pass
+        self.assertEqual(list(profiler.page_times), ["content/index.md"])
+        self.assertEqual(list(profiler.page_times["content/index.md"]), ["read"])
+    def test_timed_iter(self):
+        profiler = BuildProfiler()
+        items = list(profiler.timed_iter("to_html", ["<p>", "text", "</p>"]))
+        self.assertEqual(items, ["<p>", "text", "</p>"])
+        self.assertEqual(profiler.stage_calls["to_html"], 4)
+    def test_timed_writer(self):
+        profiler = BuildProfiler()
+        chunks = []
+        class Output:
+            def write(self, text):
+                chunks.append(text)
+        profiler.timed_writer(Output()).write("<p>text</p>")
+        self.assertEqual(chunks, ["<p>text</p>"])
+        self.assertEqual(profiler.stage_calls["write"], 1)
+    def test_merge(self):
+        first = BuildProfiler()
+        second = BuildProfiler()
+        for profiler, page in ((first, "a.md"), (second, "b.md")):
+            with profiler.page(page):
+                with profiler.stage("read"):
+                    pass
+        first.merge(second.to_dict())
+        self.assertEqual(first.stage_calls["read"], 2)
+        self.assertEqual(sorted(first.page_times), ["a.md", "b.md"])
+    def test_merge_page_totals(self):
+        first = BuildProfiler()
+        second = BuildProfiler()
+        second.add("read", 0.25, page="a.md")
+        second.add("write", 0.5, page="a.md")
+        first.merge(second.to_dict())
+        self.assertEqual(first.page_times, {"a.md": {"read": 0.25, "write": 0.5}})
+        self.assertEqual(first.to_dict()["pages"]["a.md"]["total"], 0.75)
+        self.assertIn("750.00 ms a.md", first.summary())
+    def test_to_dict_order_and_totals(self):
+        profiler = BuildProfiler()
+        profiler.add("write", 0.5, page="a.md")
+        profiler.add("read", 0.25, page="a.md")
+        data = profiler.to_dict()
+        self.assertEqual(list(data["stages"]), ["read", "write"])
+        self.assertEqual(data["pages"]["a.md"]["total"], 0.75)
+    def test_write_json(self):
+        profiler = BuildProfiler()
+        profiler.add("read", 0.25, page="a.md")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            profiler.write_json(path)
+            with open(path) as profile_file:
+                self.assertEqual(json.load(profile_file), profiler.to_dict())
+    def test_summary(self):
+        profiler = BuildProfiler()
+        profiler.add("read", 0.25, page="a.md")
+        profiler.add("write", 0.5, page="b.md")
+        summary = profiler.summary(top=1)
+        self.assertIn("write", summary)
+        self.assertNotIn("  read", summary)
+        self.assertIn("b.md", summary)
+        self.assertNotIn("a.md", summary)
+
+class TestProfilingSwitch(unittest.TestCase):
+    def tearDown(self):
+        disable_profiling()
+    def test_disabled_by_default(self):
+        self.assertIs(profile_stage("read"), NULL_STAGE)
+        self.assertIs(profile_page("a.md"), NULL_STAGE)
+    def test_enabled(self):
+        profiler = enable_profiling()
+        with profile_page("a.md"):
+            with profile_stage("read"):
+                pass
+        self.assertIs(disable_profiling(), profiler)
+        self.assertIsNone(profiling.active_profiler)
+        self.assertEqual(profiler.page_times["a.md"]["read"], profiler.stage_times["read"])
+    def test_profile_iter(self):
+        items = ["a", "b"]
+        self.assertIs(profile_iter("read", items), items)
+        profiler = enable_profiling()
+        self.assertEqual(list(profile_iter("read", items)), items)
+        self.assertEqual(profiler.stage_calls["read"], 3)
+    def test_parse_stages_recorded_only_while_enabled(self):
+        markdown = "# Title\n\nA **bold** paragraph.\n\n* one\n* two"
+        markdown_to_page(markdown)
+        profiler = enable_profiling()
+        markdown_to_page(markdown)
+        self.assertEqual(profiler.stage_calls["block_to_block_type"], 3)
+        self.assertGreaterEqual(profiler.stage_calls["text_to_text_nodes"], 3)
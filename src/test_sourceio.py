@@ -0,0 +1,38 @@
+import os
+from markdownparsing import markdown_to_blocks
+from sourceio import *
+from testsupport import TemporaryDirectoryTestCase
+
+class TestReadSource(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.root, "page.md")
+    def write_source(self, data):
+        with open(self.path, "wb") as source_file:
+            source_file.write(data)
+    def test_small_source_read_whole(self):
+        self.write_source(b"# Title\n\nA paragraph.\n")
+        self.assertEqual(read_source(self.path), "# Title\n\nA paragraph.\n")
+    def test_empty_source(self):
+        self.write_source(b"")
+        self.assertEqual(read_source(self.path, threshold=0), "")
+    def test_large_source_mapped(self):
+        self.write_source(b"# Title\n\nA paragraph.\n")
+        markdown = read_source(self.path, threshold=0)
+        self.assertIsInstance(markdown, TextChunks)
+        self.assertEqual(markdown_to_blocks(markdown), ["# Title", "A paragraph."])
+    def test_newlines_translated(self):
+        self.write_source(b"First block\r\n\r\nSecond\rblock\r")
+        with open(self.path) as source_file:
+            expected = markdown_to_blocks(source_file.read())
+        self.assertEqual(markdown_to_blocks(read_source(self.path, threshold=0)), expected)
+
+class TestIterMappedChunks(TemporaryDirectoryTestCase):
+    def test_chunks_end_at_blocks(self):
+        markdown = "".join(f"Block {number} ünïcode\nsecond line\n\n\n" for number in range(50)) + "* last\n"
+        path = os.path.join(self.root, "page.md")
+        with open(path, "w", encoding="utf-8") as source_file:
+            source_file.write(markdown)
+        for chunk_size in (1, 2, 3, 7, 16, 64, 1024):
+            chunks = list(iter_mapped_chunks(path, "utf-8", chunk_size))
+            self.assertEqual(markdown_to_blocks(TextChunks(chunks)), markdown_to_blocks(markdown))
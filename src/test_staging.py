@@ -0,0 +1,68 @@
+import os
+from staging import *
+from testsupport import TemporaryDirectoryTestCase
+
+class TestStaging(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = os.path.join(self.root, "public")
+    def publish_build(self, files, reuse_previous=True):
+        staging_dir = create_staging_directory(self.output_dir, reuse_previous)
+        for relative_path, text in files.items():
+            self.write_file(os.path.join(staging_dir, relative_path), text)
+        publish_directory(staging_dir, self.output_dir)
+        return staging_dir
+    def test_first_publish(self):
+        staging_dir = self.publish_build({"index.html": "first"})
+        self.assertTrue(os.path.islink(self.output_dir))
+        self.assertEqual(live_directory(self.output_dir), os.path.realpath(staging_dir))
+        self.assertEqual(self.read_file(os.path.join(self.output_dir, "index.html")), "first")
+    def test_previous_output_hardlinked(self):
+        self.publish_build({"index.html": "first", os.path.join("posts", "post.html"): "post"})
+        live_post = os.path.join(self.output_dir, "posts", "post.html")
+        staging_dir = create_staging_directory(self.output_dir)
+        staged_post = os.path.join(staging_dir, "posts", "post.html")
+        self.assertTrue(os.path.samefile(live_post, staged_post))
+        remove_staging_directory(staging_dir)
+    def test_publish_replaces_previous_build(self):
+        first_dir = self.publish_build({"index.html": "first"})
+        second_dir = self.publish_build({"index.html": "second"})
+        self.assertEqual(self.read_file(os.path.join(self.output_dir, "index.html")), "second")
+        self.assertEqual(previous_directory(self.output_dir), os.path.realpath(first_dir))
+        self.assertEqual(self.read_file(os.path.join(first_dir, "index.html")), "first")
+        self.publish_build({"index.html": "third"})
+        self.assertFalse(os.path.exists(first_dir))
+        self.assertEqual(previous_directory(self.output_dir), os.path.realpath(second_dir))
+    def test_previous_build_kept_by_next_staging(self):
+        first_dir = self.publish_build({"index.html": "first"})
+        self.publish_build({"index.html": "second"})
+        staging_dir = create_staging_directory(self.output_dir)
+        self.assertTrue(os.path.exists(first_dir))
+        remove_staging_directory(staging_dir)
+    def test_no_reuse(self):
+        self.publish_build({"index.html": "first"})
+        staging_dir = create_staging_directory(self.output_dir, reuse_previous=False)
+        self.assertEqual(os.listdir(staging_dir), [])
+        remove_staging_directory(staging_dir)
+    def test_abandoned_build_removed(self):
+        self.publish_build({"index.html": "first"})
+        abandoned_dir = create_staging_directory(self.output_dir)
+        staging_dir = create_staging_directory(self.output_dir)
+        self.assertFalse(os.path.exists(abandoned_dir))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "index.html")))
+        remove_staging_directory(staging_dir)
+    def test_discarded_build_leaves_output(self):
+        self.publish_build({"index.html": "first"})
+        staging_dir = create_staging_directory(self.output_dir)
+        self.write_file(os.path.join(staging_dir, "index.html"), "broken")
+        remove_staging_directory(staging_dir)
+        self.assertEqual(self.read_file(os.path.join(self.output_dir, "index.html")), "first")
+    def test_plain_directory_migrated(self):
+        self.write_file(os.path.join(self.output_dir, "index.html"), "legacy")
+        self.publish_build({"index.html": "first"})
+        self.assertTrue(os.path.islink(self.output_dir))
+        self.assertEqual(self.read_file(os.path.join(self.output_dir, "index.html")), "first")
+        self.assertEqual(self.read_file(os.path.join(previous_directory(self.output_dir), "index.html")), "legacy")
+        self.assertEqual(len(os.listdir(self.root)), 4)
+        self.publish_build({"index.html": "second"})
+        self.assertEqual(len(os.listdir(self.root)), 4)
@@ -29,4 +29,9 @@ class TestTextNode(unittest.TestCase):
     def test_validate_type(self):
         node = TextNode("This is a text node", "GARBAGE")
         with self.assertRaises(ValueError, msg="Invalid text type."):
-            validate_type(node)
\ No newline at end of file
+            validate_type(node)
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = True
@@ -1,4 +1,5 @@
 import unittest
+import random
 from textnode import *
 from textparsing import *
 from markdownparsing import *
@@ -164,6 +165,37 @@ class TestSplitNodesDelimiter(unittest.TestCase):
         ]
         self.assertEqual(new_nodes, expected)
 
+class TestSplitNodesDelimiterRepeats(unittest.TestCase):
+    def test_repeated_text_segments(self):
+        nodes = [
+            TextNode("same`code`same", TextType.TEXT)
+        ]
+        new_nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        expected = [
+            TextNode("same", TextType.TEXT),
+            TextNode("code", TextType.CODE),
+            TextNode("same", TextType.TEXT)
+        ]
+        self.assertEqual(new_nodes, expected)
+    def test_repeated_segment_changes_parity(self):
+        nodes = [
+            TextNode("x`x`x`x`", TextType.TEXT)
+        ]
+        new_nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        expected = [
+            TextNode("x", TextType.TEXT),
+            TextNode("x", TextType.CODE),
+            TextNode("x", TextType.TEXT),
+            TextNode("x", TextType.CODE)
+        ]
+        self.assertEqual(new_nodes, expected)
+    def test_many_segments(self):
+        text = "word `code`" * 5000
+        new_nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
+        self.assertEqual(len(new_nodes), 10000)
+        self.assertTrue(all(node.textType == TextType.CODE for node in new_nodes[1::2]))
+        self.assertTrue(all(node.textType == TextType.TEXT for node in new_nodes[0::2]))
+
 class TestSplitNodesImage(unittest.TestCase):
     def test_node_none(self):
         nodes = [
@@ -482,6 +514,51 @@ class TestSplitNodesLink(unittest.TestCase):
         ]
         self.assertEqual(new_nodes, expected)
 
+class TestSplitNodesOffsets(unittest.TestCase):
+    def test_many_links(self):
+        text = " ".join(f"[link {number}](https://example.com/{number})" for number in range(300))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 599)
+        self.assertEqual(new_nodes[0], TextNode("link 0", TextType.LINK, "https://example.com/0"))
+        self.assertEqual(new_nodes[1], TextNode(" ", TextType.TEXT))
+        self.assertEqual(new_nodes[-1], TextNode("link 299", TextType.LINK, "https://example.com/299"))
+    def test_many_images(self):
+        text = "".join(f"![image {number}](/images/{number}.png)," for number in range(300))
+        new_nodes = split_nodes_image([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 600)
+        self.assertEqual(new_nodes[-2], TextNode("image 299", TextType.IMAGE, "/images/299.png"))
+        self.assertEqual(new_nodes[-1], TextNode(",", TextType.TEXT))
+    def test_link_matching_earlier_image_text(self):
+        nodes = [
+            TextNode("![same](https://www.boot.dev) and [same](https://www.boot.dev)", TextType.TEXT)
+        ]
+        new_nodes = split_nodes_link(nodes)
+        expected = [
+            TextNode("![same](https://www.boot.dev) and ", TextType.TEXT),
+            TextNode("same", TextType.LINK, "https://www.boot.dev")
+        ]
+        self.assertEqual(new_nodes, expected)
+    def test_image_then_link_pipeline(self):
+        nodes = [
+            TextNode("![same](https://www.boot.dev) and [same](https://www.boot.dev)", TextType.TEXT)
+        ]
+        new_nodes = split_nodes_link(split_nodes_image(nodes))
+        expected = [
+            TextNode("same", TextType.IMAGE, "https://www.boot.dev"),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("same", TextType.LINK, "https://www.boot.dev")
+        ]
+        self.assertEqual(new_nodes, expected)
+    def test_link_overlapping_image(self):
+        nodes = [TextNode("[a](![b)](c)", TextType.TEXT)]
+        expected = [TextNode("[a](", TextType.TEXT), TextNode("b)", TextType.IMAGE, "c")]
+        self.assertEqual(split_nodes_link(split_nodes_image(nodes)), expected)
+        self.assertEqual(text_to_text_nodes("[a](![b)](c)"), expected)
+    def test_bracket_heavy_matches_reference(self):
+        text = " ".join(f"[link{number}](/url) ![image{number}](/image.png) [note] (aside) !" for number in range(100))
+        self.assertEqual(text_to_text_nodes(text), text_to_text_nodes_reference(text))
+        self.assertEqual(len(text_to_text_nodes(text)), 400)
+
 class TestTextToTextNodes(unittest.TestCase):
     def test_Bootdev_sample(self):
         text = "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
@@ -498,4 +575,76 @@ class TestTextToTextNodes(unittest.TestCase):
             TextNode(" and a ", TextType.TEXT),
             TextNode("link", TextType.LINK, "https://boot.dev")
         ]
-        self.assertEqual(nodes, expected)
\ No newline at end of file
+        self.assertEqual(nodes, expected)
+def reference_result(function, text):
+    try:
+        return function(text)
+    except ValueError as error:
+        return str(error)
+
+class TestTokenizeInline(unittest.TestCase):
+    def test_plain_text_fast_path(self):
+        self.assertEqual(tokenize_inline("Just plain text."), [TextNode("Just plain text.", TextType.TEXT)])
+    def test_empty_text(self):
+        self.assertEqual(tokenize_inline(""), [])
+    def test_all_types(self):
+        text = "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+        self.assertEqual(tokenize_inline(text), text_to_text_nodes_reference(text))
+    def test_code_hides_delimiters(self):
+        text = "Run `a * b ** c` now"
+        expected = [
+            TextNode("Run ", TextType.TEXT),
+            TextNode("a * b ** c", TextType.CODE),
+            TextNode(" now", TextType.TEXT)
+        ]
+        self.assertEqual(tokenize_inline(text), expected)
+    def test_bold_hides_italic(self):
+        text = "**bold *with* stars**"
+        self.assertEqual(tokenize_inline(text), [TextNode("bold *with* stars", TextType.BOLD)])
+    def test_adjacent_stars(self):
+        text = "**bold*** italic*"
+        expected = [
+            TextNode("bold", TextType.BOLD),
+            TextNode(" italic", TextType.ITALIC)
+        ]
+        self.assertEqual(tokenize_inline(text), expected)
+        self.assertEqual(tokenize_inline(text), text_to_text_nodes_reference(text))
+    def test_link_inside_code(self):
+        text = "`[link](url)` and [link](url)"
+        expected = [
+            TextNode("[link](url)", TextType.CODE),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "url")
+        ]
+        self.assertEqual(tokenize_inline(text), expected)
+    def test_unpaired_code(self):
+        with self.assertRaises(ValueError):
+            tokenize_inline("An `unpaired code delimiter")
+    def test_unpaired_bold(self):
+        with self.assertRaises(ValueError):
+            tokenize_inline("An **unpaired bold delimiter")
+    def test_bold_across_code(self):
+        with self.assertRaises(ValueError):
+            tokenize_inline("**bold `code` bold**")
+    def test_italic_around_bold(self):
+        with self.assertRaises(ValueError):
+            tokenize_inline("*italic **bold** italic*")
+    def test_repeated_segments(self):
+        text = "a`b`a`a`a"
+        self.assertEqual(tokenize_inline(text), text_to_text_nodes_reference(text))
+    def test_matches_reference_repeated_words(self):
+        syntax = ["`", "*", "**", "[", "](", ")", "!", "![a](u)", "[a](u)", "a", "a", " "]
+        rng = random.Random(2)
+        for case in range(3000):
+            text = "".join(rng.choice(syntax) for _ in range(rng.randint(0, 16)))
+            self.assertEqual(reference_result(tokenize_inline, text), reference_result(text_to_text_nodes_reference, text), text)
+    def test_matches_reference(self):
+        syntax = ["`", "*", "**", "***", "****", "[", "]", "(", ")", "!", "![alt](url)", "[anchor](url)", "](", " "]
+        rng = random.Random(1)
+        for case in range(3000):
+            parts = []
+            for word_number in range(rng.randint(1, 12)):
+                parts.append(f"w{word_number}")
+                parts.append("".join(rng.choice(syntax) for _ in range(rng.randint(0, 3))))
+            text = "".join(parts)
+            self.assertEqual(reference_result(tokenize_inline, text), reference_result(text_to_text_nodes_reference, text), text)
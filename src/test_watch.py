@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from watch import *
+from testsupport import TemporaryDirectoryTestCase
+
+class TestSiteWatcher(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content_dir = os.path.join(self.root, "content")
+        self.static_dir = os.path.join(self.root, "static")
+        self.template_path = os.path.join(self.root, "template.html")
+        self.page_path = os.path.join(self.content_dir, "index.md")
+        self.write_file(self.template_path, "{{ Content }}")
+        self.write_file(self.page_path, "# Home")
+        self.write_file(os.path.join(self.static_dir, "index.css"), "body {}")
+        self.watcher = SiteWatcher(self.content_dir, self.static_dir, self.template_path, use_inotify=False)
+    def tearDown(self):
+        self.watcher.close()
+        super().tearDown()
+    def test_no_changes(self):
+        self.assertFalse(self.watcher.poll())
+    def test_content_changed(self):
+        self.write_file(self.page_path, "# Home page")
+        self.assertEqual(self.watcher.poll(), ChangeSet(content_changed=[self.page_path]))
+        self.assertFalse(self.watcher.poll())
+    def test_content_added(self):
+        new_page = os.path.join(self.content_dir, "posts", "first.md")
+        self.write_file(new_page, "# First")
+        self.assertEqual(self.watcher.poll(), ChangeSet(content_changed=[new_page]))
+    def test_content_removed(self):
+        os.remove(self.page_path)
+        self.assertEqual(self.watcher.poll(), ChangeSet(content_removed=[self.page_path]))
+    def test_non_markdown_content_ignored(self):
+        self.write_file(os.path.join(self.content_dir, "notes.txt"), "notes")
+        self.assertFalse(self.watcher.poll())
+    def test_template_changed(self):
+        self.write_file(self.template_path, "<main>{{ Content }}</main>")
+        self.assertEqual(self.watcher.poll(), ChangeSet(template_changed=True))
+    def test_static_changed(self):
+        self.write_file(os.path.join(self.static_dir, "images", "logo.png"), "PNG")
+        self.assertEqual(self.watcher.poll(), ChangeSet(static_changed=True))
+
+# stands in for libc, recording the paths inotify_add_watch is called with
+class RecordingLibc:
+    def __init__(self):
+        self.watched = []
+    def inotify_init1(self, flags):
+        return os.open(os.devnull, os.O_RDONLY)
+    def inotify_add_watch(self, fd, path, mask):
+        self.watched.append(os.fsdecode(path))
+        return len(self.watched)
+
+class TestInotifyWaker(unittest.TestCase):
+    def test_wakes_on_change(self):
+        waker = InotifyWaker.create()
+        if waker is None:
+            self.skipTest("inotify is not available")
+        with tempfile.TemporaryDirectory() as directory:
+            waker.watch_directories([directory])
+            self.assertFalse(waker.wait(0))
+            with open(os.path.join(directory, "page.md"), "w") as written_file:
+                written_file.write("# Page")
+            self.assertTrue(waker.wait(1))
+        waker.close()
+    def test_template_directory_not_walked(self):
+        with tempfile.TemporaryDirectory() as directory:
+            content_dir = os.path.join(directory, "content")
+            static_dir = os.path.join(directory, "static")
+            for path in (os.path.join(content_dir, "posts"), static_dir, os.path.join(directory, "public", "posts")):
+                os.makedirs(path)
+            template_path = os.path.join(directory, "template.html")
+            with open(template_path, "w") as written_file:
+                written_file.write("{{ Content }}")
+            libc = RecordingLibc()
+            watcher = SiteWatcher(content_dir, static_dir, template_path, use_inotify=False)
+            watcher.waker = InotifyWaker(libc)
+            watcher.take_snapshot()
+            watcher.close()
+        expected = [content_dir, os.path.join(content_dir, "posts"), static_dir, directory]
+        self.assertEqual(sorted(libc.watched), sorted(expected))
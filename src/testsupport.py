@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+
+# a test case that works under root, a temporary directory created for each test and removed after it
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+    def tearDown(self):
+        self.directory.cleanup()
+    # files are replaced rather than rewritten, like generate_page and copy_file do, so a hardlinked copy
+    # of the previous file is never modified
+    def write_file(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.lexists(path):
+            os.unlink(path)
+        with open(path, "w") as written_file:
+            written_file.write(text)
+    def read_file(self, path):
+        with open(path) as read_file:
+            return read_file.read()
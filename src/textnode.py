@@ -15,7 +15,9 @@ def validate_type(text_node):
     if not isinstance(text_node.textType, TextType):
         raise ValueError("Invalid text type.")
 
+# nodes declare __slots__ so that the many created for a large page carry no per-instance __dict__
 class TextNode:
+    __slots__ = ("text", "textType", "url")
     def __init__(self, text, TextType, url=None):
         self.text = text
         self.textType = TextType
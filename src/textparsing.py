@@ -1,52 +1,45 @@
+import re
 from textnode import *
 from markdownparsing import *
+import profiling
+from profiling import profile_stage
 
+INLINE_DELIMITER_PATTERN = re.compile(r"`|\*\*?")
+DELIMITER_TEXT_TYPES = {"`": TextType.CODE, "**": TextType.BOLD, "*": TextType.ITALIC}
+
+# scans each text node once with str.find; the segments after odd-numbered delimiters get text_type
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
+    delimiter_length = len(delimiter)
     for node in old_nodes:
         if node.textType != TextType.TEXT:
             new_nodes.append(node)
-        else:
-            split_nodes = node.text.split(delimiter)
-            if (len(split_nodes) % 2 == 0) and (len(split_nodes) > 1):
-                raise ValueError("Malformed Markdown. Odd number of delimiters in text.")
-            else:
-                for split in split_nodes:
-                    if split_nodes.index(split) % 2 == 0:
-                        if split != '':
-                            split_node = TextNode(split, TextType.TEXT)
-                            new_nodes.append(split_node)
-                    else:
-                        if split != '':
-                            split_node = TextNode(split, text_type)
-                            new_nodes.append(split_node)
+            continue
+        text = node.text
+        if text.count(delimiter) % 2 == 1:
+            raise ValueError("Malformed Markdown. Odd number of delimiters in text.")
+        position = 0
+        inside_delimiters = False
+        while True:
+            found = text.find(delimiter, position)
+            segment_end = len(text) if found == -1 else found
+            if segment_end > position:
+                segment_type = text_type if inside_delimiters else TextType.TEXT
+                new_nodes.append(TextNode(text[position:segment_end], segment_type))
+            if found == -1:
+                break
+            position = found + delimiter_length
+            inside_delimiters = not inside_delimiters
     return new_nodes
 
+# each text node's image and link spans are found in a single scan; spans of the other type stay in the text nodes
 def split_nodes_image(old_nodes):
     new_nodes = []
     for node in old_nodes:
         if node.textType != TextType.TEXT:
             new_nodes.append(node)
             continue
-        current_text = node.text
-        while True:
-            images = extract_markdown_images(current_text)
-            if not images:
-                if current_text:
-                    last_node = TextNode(current_text, TextType.TEXT)
-                    new_nodes.append(last_node)
-                break
-            image_alt, image_URL = images[0]
-            split_nodes = current_text.split(f'![{image_alt}]({image_URL})', 1)
-            if split_nodes[0] != '':
-                first_node = TextNode(split_nodes[0], TextType.TEXT)
-                new_nodes.append(first_node)
-            second_node = TextNode(image_alt, TextType.IMAGE, image_URL)
-            new_nodes.append(second_node)
-            if len(split_nodes) > 1:
-                current_text = split_nodes[1]
-            else:
-                break
+        append_span_nodes(new_nodes, node.text, 0, len(node.text), links=False)
     return new_nodes
 
 def split_nodes_link(old_nodes):
@@ -55,32 +48,89 @@ def split_nodes_link(old_nodes):
         if node.textType != TextType.TEXT:
             new_nodes.append(node)
             continue
-        current_text = node.text
-        while True:
-            links = extract_markdown_links(current_text)
-            if not links:
-                if current_text:
-                    last_node = TextNode(current_text, TextType.TEXT)
-                    new_nodes.append(last_node)
-                break
-            link_anchor, link_URL = links[0]
-            split_nodes = current_text.split(f'[{link_anchor}]({link_URL})', 1)
-            if split_nodes[0] != '':
-                first_node = TextNode(split_nodes[0], TextType.TEXT)
-                new_nodes.append(first_node)
-            second_node = TextNode(link_anchor, TextType.LINK, link_URL)
-            new_nodes.append(second_node)
-            if len(split_nodes) > 1:
-                current_text = split_nodes[1]
-            else:
-                break
+        append_span_nodes(new_nodes, node.text, 0, len(node.text), images=False)
     return new_nodes
 
-def text_to_text_nodes(text):
+# appends image nodes (if images) and link nodes (if links) for the spans of text[start:end] found by the one
+# iter_markdown_spans scan, and text nodes for the text between them, which includes any span left out
+def append_span_nodes(nodes, text, start, end, images=True, links=True):
+    position = start
+    for span_type, span_text, url, span_start, span_end in iter_markdown_spans(text, start, end):
+        if span_type is SpanType.IMAGE:
+            if not images:
+                continue
+            node = TextNode(span_text, TextType.IMAGE, url)
+        else:
+            if not links:
+                continue
+            node = TextNode(span_text, TextType.LINK, url)
+        if span_start > position:
+            nodes.append(TextNode(text[position:span_start], TextType.TEXT))
+        nodes.append(node)
+        position = span_end
+    if end > position:
+        nodes.append(TextNode(text[position:end], TextType.TEXT))
+
+# the original five-pass pipeline, kept as the reference that tokenize_inline must match
+def text_to_text_nodes_reference(text):
     current_nodes = [TextNode(text, TextType.TEXT)]
     current_nodes = split_nodes_delimiter(current_nodes, "`", TextType.CODE)
     current_nodes = split_nodes_delimiter(current_nodes, "**", TextType.BOLD)
     current_nodes = split_nodes_delimiter(current_nodes, "*", TextType.ITALIC)
     current_nodes = split_nodes_image(current_nodes)
     current_nodes = split_nodes_link(current_nodes)
-    return current_nodes
\ No newline at end of file
+    return current_nodes
+
+def append_text_nodes(nodes, text):
+    if not text:
+        return
+    if "[" not in text:
+        nodes.append(TextNode(text, TextType.TEXT))
+        return
+    append_span_nodes(nodes, text, 0, len(text))
+
+# single left-to-right scan producing the same nodes as text_to_text_nodes_reference
+# delimiters keep the reference precedence: code spans hide everything inside them, bold hides italics,
+# and images and links are only recognised in plain text between delimited spans
+# a delimiter that the reference would leave unpaired raises the same ValueError
+def tokenize_inline(text):
+    if ("`" not in text) and ("*" not in text) and ("[" not in text):
+        if text:
+            return [TextNode(text, TextType.TEXT)]
+        return []
+    nodes = []
+    state = TextType.TEXT
+    position = 0
+    for match in INLINE_DELIMITER_PATTERN.finditer(text):
+        delimiter = match.group()
+        if state == TextType.CODE:
+            if delimiter != "`":
+                continue
+        elif state == TextType.BOLD:
+            if delimiter == "*":
+                continue
+            if delimiter == "`":
+                raise ValueError("Malformed Markdown. Odd number of delimiters in text.")
+        elif state == TextType.ITALIC:
+            if delimiter != "*":
+                raise ValueError("Malformed Markdown. Odd number of delimiters in text.")
+        segment = text[position:match.start()]
+        position = match.end()
+        if state == TextType.TEXT:
+            append_text_nodes(nodes, segment)
+            state = DELIMITER_TEXT_TYPES[delimiter]
+        else:
+            if segment != "":
+                nodes.append(TextNode(segment, state))
+            state = TextType.TEXT
+    if state != TextType.TEXT:
+        raise ValueError("Malformed Markdown. Odd number of delimiters in text.")
+    append_text_nodes(nodes, text[position:])
+    return nodes
+
+# the stage is only entered while profiling, so a build without it pays one check per text
+def text_to_text_nodes(text):
+    if profiling.active_profiler is None:
+        return tokenize_inline(text)
+    with profile_stage("text_to_text_nodes"):
+        return tokenize_inline(text)
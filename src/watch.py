@@ -0,0 +1,250 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+POLL_INTERVAL = 0.05
+DEBOUNCE_DELAY = 0.01
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    '<script>new EventSource("' + LIVE_RELOAD_PATH + '").onmessage = function () { location.reload(); };</script>'
+)
+
+# maps every file under each directory, and each extra file, to its (mtime, size)
+def snapshot_files(directories, files=()):
+    snapshot = {}
+    for directory in directories:
+        pending = [directory]
+        while pending:
+            current_dir = pending.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                        elif entry.is_dir():
+                            pending.append(entry.path)
+            except FileNotFoundError:
+                continue
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+# template_changed is True when the template was edited
+# content_changed and content_removed list markdown sources that were added or edited, and deleted
+# static_changed is True when anything under the static directory was added, edited or deleted
+class ChangeSet:
+    def __init__(self, template_changed=False, content_changed=None, content_removed=None, static_changed=False):
+        self.template_changed = template_changed
+        self.content_changed = content_changed if content_changed is not None else []
+        self.content_removed = content_removed if content_removed is not None else []
+        self.static_changed = static_changed
+    def __bool__(self):
+        return bool(self.template_changed or self.content_changed or self.content_removed or self.static_changed)
+    def __eq__(self, other):
+        return (
+            self.template_changed == other.template_changed and
+            self.content_changed == other.content_changed and
+            self.content_removed == other.content_removed and
+            self.static_changed == other.static_changed
+        )
+    def __repr__(self):
+        return f"ChangeSet({self.template_changed}, {self.content_changed}, {self.content_removed}, {self.static_changed})"
+
+# wakes the watcher as soon as the kernel reports a change in a watched directory
+# only the fact that something changed is used; the snapshot diff decides what changed
+class InotifyWaker:
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    def __init__(self, libc):
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    @classmethod
+    def create(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            libc.inotify_init1
+            return cls(libc)
+        except (OSError, AttributeError):
+            return None
+    # inotify is not recursive, so every directory under each of directories is added, while each of
+    # single_directories is added on its own, without its subdirectories; re-adding an existing watch is harmless
+    def watch_directories(self, directories, single_directories=()):
+        for top in directories:
+            if not os.path.isdir(top):
+                continue
+            for current_dir, _, _ in os.walk(top):
+                self.libc.inotify_add_watch(self.fd, os.fsencode(current_dir), self.WATCH_MASK)
+        for directory in single_directories:
+            if os.path.isdir(directory):
+                self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        time.sleep(DEBOUNCE_DELAY)
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        return True
+    def close(self):
+        os.close(self.fd)
+
+class SiteWatcher:
+    def __init__(self, content_dir, static_dir, template_path, use_inotify=True):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.waker = InotifyWaker.create() if use_inotify else None
+        self.snapshot = self.take_snapshot()
+    # the template's directory is usually the project root, holding .git and the build output, so only the
+    # directory itself is watched, which is enough to see the template edited or replaced
+    def watched_directories(self):
+        return [self.content_dir, self.static_dir]
+    def template_directory(self):
+        return os.path.dirname(os.path.abspath(self.template_path))
+    def take_snapshot(self):
+        if self.waker is not None:
+            self.waker.watch_directories(self.watched_directories(), [self.template_directory()])
+        return snapshot_files([self.content_dir, self.static_dir], [self.template_path])
+    # blocks until something may have changed or timeout seconds pass
+    def wait(self, timeout=1.0):
+        if self.waker is not None:
+            return self.waker.wait(timeout)
+        time.sleep(min(timeout, POLL_INTERVAL))
+        return True
+    def poll(self):
+        previous = self.snapshot
+        current = self.take_snapshot()
+        self.snapshot = current
+        changes = ChangeSet()
+        content_prefix = os.path.join(self.content_dir, "")
+        static_prefix = os.path.join(self.static_dir, "")
+        for path in sorted(set(previous) | set(current)):
+            if previous.get(path) == current.get(path):
+                continue
+            if path == self.template_path:
+                changes.template_changed = True
+            elif path.startswith(static_prefix):
+                changes.static_changed = True
+            elif path.startswith(content_prefix) and path.lower().endswith(".md"):
+                if path in current:
+                    changes.content_changed.append(path)
+                else:
+                    changes.content_removed.append(path)
+        return changes
+    def close(self):
+        if self.waker is not None:
+            self.waker.close()
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH:
+            self.send_reload_events()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path) and self.path.split("?", 1)[0].endswith(("/", ".html")):
+            self.send_html_with_script(path)
+        else:
+            super().do_GET()
+    def send_html_with_script(self, path):
+        with open(path, "rb") as html_file:
+            page = html_file.read()
+        script = LIVE_RELOAD_SCRIPT.encode()
+        body_end = page.rfind(b"</body>")
+        if body_end == -1:
+            page = page + script
+        else:
+            page = page[:body_end] + script + page[body_end:]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(page)
+    def send_reload_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        version = self.server.reload_version
+        try:
+            while True:
+                with self.server.reload_condition:
+                    self.server.reload_condition.wait_for(lambda: self.server.reload_version != version, timeout=15)
+                    changed = self.server.reload_version != version
+                    version = self.server.reload_version
+                if changed:
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+    def log_message(self, format, *args):
+        return
+
+# serves output_dir over HTTP and tells open pages to reload through server-sent events when notify is called
+class LiveReloadServer(ThreadingHTTPServer):
+    daemon_threads = True
+    def __init__(self, output_dir, port=8888, host="localhost"):
+        super().__init__((host, port), partial(LiveReloadHandler, directory=output_dir))
+        self.reload_condition = threading.Condition()
+        self.reload_version = 0
+        self.thread = None
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+    def notify(self):
+        with self.reload_condition:
+            self.reload_version += 1
+            self.reload_condition.notify_all()
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+# rebuild is called with each non-empty ChangeSet and returns True when the output changed successfully
+def watch_site(watcher, rebuild, server=None):
+    try:
+        while True:
+            if not watcher.wait():
+                continue
+            changes = watcher.poll()
+            if not changes:
+                continue
+            started = time.perf_counter()
+            if rebuild(changes) and (server is not None):
+                server.notify()
+            print(f"Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms.")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if server is not None:
+            server.stop()